@@ -4,9 +4,27 @@ Define o formato de mensagens e compressão
 """
 import gzip
 import json
+import struct
 from enum import IntEnum
 from typing import Any, Optional
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import zstandard
+    HAS_ZSTD = True
+    # Reaproveitados entre chamadas (criar o contexto é caro)
+    _ZSTD_COMPRESSOR = zstandard.ZstdCompressor(level=1)
+    _ZSTD_DECOMPRESSOR = zstandard.ZstdDecompressor()
+    _ZSTD_ERRORS: tuple[type[Exception], ...] = (zstandard.ZstdError,)
+except ImportError:
+    HAS_ZSTD = False
+    _ZSTD_ERRORS = ()
+
 
 class MagicByte(IntEnum):
     """Magic bytes para identificar tipo de payload"""
@@ -16,12 +34,389 @@ class MagicByte(IntEnum):
     # Reservados para futuras expansões
     MSGPACK = 0x02  # MessagePack (futuro)
     PROTOBUF = 0x03 # Protocol Buffers (futuro)
+    
+    BINARY = 0x04   # Struct binário (campos fixos + listas com prefixo de tamanho)
+    ZSTD = 0x05     # JSON comprimido com zstd (requer zstandard)
+
+
+# ========== FORMATO BINÁRIO ==========
+# Layout (little-endian):
+#   versão (u8) + campos fixos (ponto fixo: valor * 10**casas, ver _QUANT_CODES)
+#   adapter_name (u8 len + utf-8)
+#   storage: u8 count + [u8 len + nome utf-8 + campos de STORAGE_FIELDS (ver _STORAGE_QUANT)]
+#   fans:    u8 count + [u8 len + nome utf-8 + u16 rpm]
+# Versão 1 (campos em f32) continua sendo decodificada.
+BINARY_VERSION = 2
+
+# (seção, chave, casas decimais na decodificação; None = inteiro)
+BINARY_FIELDS: tuple[tuple[str, str, Optional[int]], ...] = (
+    ("cpu", "usage", 1),
+    ("cpu", "temp", 1),
+    ("cpu", "voltage", 3),
+    ("cpu", "power", 1),
+    ("cpu", "clock", 0),
+    ("gpu", "load", 1),
+    ("gpu", "temp", 1),
+    ("gpu", "voltage", 3),
+    ("gpu", "clock_core", 0),
+    ("gpu", "clock_mem", 0),
+    ("gpu", "fan", 0),
+    ("gpu", "mem_used_mb", 0),
+    ("mobo", "temp", 1),
+    ("ram", "percent", 1),
+    ("ram", "used_gb", 2),
+    ("ram", "total_gb", 2),
+    ("network", "down_kbps", 1),
+    ("network", "up_kbps", 1),
+    ("network", "ping_ms", 1),
+    ("network", "link_speed_mbps", None),
+)
+
+STORAGE_FIELDS: tuple[str, ...] = (
+    "temp", "health", "used_space",
+    "read_activity", "write_activity", "total_activity",
+    "read_rate", "write_rate", "data_read_gb", "data_written_gb",
+)
+
+# Tipo struct de cada campo de BINARY_FIELDS no formato v2 (valores saturam nos limites)
+_QUANT_CODES: tuple[str, ...] = (
+    "h", "h", "h", "h", "H",        # cpu: usage, temp, voltage, power, clock
+    "h", "h", "h", "H", "H", "H",   # gpu: load, temp, voltage, clock_core, clock_mem, fan
+    "i",                            # gpu: mem_used_mb
+    "h",                            # mobo: temp
+    "h", "i", "i",                  # ram: percent, used_gb, total_gb
+    "i", "i", "i", "i",             # network: down_kbps, up_kbps, ping_ms, link_speed_mbps
+)
+_QUANT_LIMITS = {
+    "h": (-0x8000, 0x7FFF), "H": (0, 0xFFFF),
+    "i": (-0x80000000, 0x7FFFFFFF), "I": (0, 0xFFFFFFFF),
+    "Q": (0, 0xFFFFFFFFFFFFFFFF),
+}
+
+# (seção, chave, escala, mínimo, máximo) na ordem de BINARY_FIELDS
+_QUANT_FIELDS: tuple[tuple[str, str, int, int, int], ...] = tuple(
+    (section, key, 10 ** (digits or 0), *_QUANT_LIMITS[code])
+    for (section, key, digits), code in zip(BINARY_FIELDS, _QUANT_CODES)
+)
+
+# (tipo struct, escala) de cada campo de STORAGE_FIELDS no formato v2
+_STORAGE_QUANT: tuple[tuple[str, int], ...] = (
+    ("h", 100),                         # temp (°C)
+    ("H", 100), ("H", 100),             # health, used_space (%)
+    ("H", 100), ("H", 100), ("H", 100), # read/write/total_activity (%)
+    ("Q", 1), ("Q", 1),                 # read_rate, write_rate (bytes/s)
+    ("I", 100), ("I", 100),             # data_read_gb, data_written_gb
+)
+# (chave, escala, mínimo, máximo) na ordem de STORAGE_FIELDS
+_STORAGE_FIELDS_Q: tuple[tuple[str, int, int, int], ...] = tuple(
+    (key, scale, *_QUANT_LIMITS[code])
+    for key, (code, scale) in zip(STORAGE_FIELDS, _STORAGE_QUANT)
+)
+
+_BINARY_HEADER = struct.Struct("<B" + "".join(_QUANT_CODES))
+_STORAGE_RECORD = struct.Struct("<" + "".join(code for code, _ in _STORAGE_QUANT))
+_FAN_RECORD = struct.Struct("<H")
+_U8 = struct.Struct("<B")
+
+# Versão 1: mesmos campos em f32
+_BINARY_HEADER_V1 = struct.Struct("<B" + "f" * len(BINARY_FIELDS))
+_STORAGE_RECORD_V1 = struct.Struct("<" + "f" * len(STORAGE_FIELDS))
+_FAN_RECORD_V1 = struct.Struct("<f")
+
+
+def _quantize(value: Any, scale: int, low: int, high: int) -> int:
+    """Converte para inteiro em ponto fixo (valor * escala), saturando em [low, high]"""
+    value = float(value or 0)
+    if value != value:  # NaN
+        return 0
+    value = round(value * scale)
+    return low if value < low else high if value > high else value
+
+
+def _quantized_values(data: dict[str, Any]) -> list[int]:
+    """Campos fixos de BINARY_FIELDS em ponto fixo"""
+    return [
+        _quantize(data.get(section, {}).get(key), scale, low, high)
+        for section, key, scale, low, high in _QUANT_FIELDS
+    ]
+
+
+def _storage_values(disk: dict[str, Any]) -> list[int]:
+    """Campos de um disco em ponto fixo (ver _STORAGE_QUANT)"""
+    return [
+        _quantize(disk.get(key), scale, low, high)
+        for key, scale, low, high in _STORAGE_FIELDS_Q
+    ]
+
+
+def _pack_str(text: str) -> bytes:
+    """Codifica string com prefixo de tamanho (máx. 255 bytes)"""
+    raw = str(text).encode('utf-8')[:255]
+    return _U8.pack(len(raw)) + raw
+
+
+def _unpack_str(view: memoryview, offset: int) -> tuple[str, int]:
+    """Lê string com prefixo de tamanho, retorna (texto, novo offset)"""
+    size = view[offset]
+    offset += 1
+    text = bytes(view[offset:offset + size]).decode('utf-8', errors='replace')
+    return text, offset + size
+
+
+def pack_binary(data: dict[str, Any]) -> bytes:
+    """
+    Codifica payload de telemetria no formato binário (sem magic byte)
+    
+    Args:
+        data: Dicionário com dados de telemetria
+    
+    Returns:
+        Bytes no layout descrito em BINARY_FIELDS
+    """
+    parts = [
+        _BINARY_HEADER.pack(BINARY_VERSION, *_quantized_values(data)),
+        _pack_str(data.get("network", {}).get("adapter_name", "")),
+    ]
+    
+    storage = data.get("storage", [])[:255]
+    parts.append(_U8.pack(len(storage)))
+    for disk in storage:
+        parts.append(_pack_str(disk.get("name", "")))
+        parts.append(_STORAGE_RECORD.pack(*_storage_values(disk)))
+    
+    fans = data.get("fans", [])[:255]
+    parts.append(_U8.pack(len(fans)))
+    for fan in fans:
+        parts.append(_pack_str(fan.get("name", "")))
+        parts.append(_FAN_RECORD.pack(_quantize(fan.get("rpm"), 1, 0, 0xFFFF)))
+    
+    return b"".join(parts)
+
+
+def _pack_str_into(buf: bytearray, offset: int, text: str) -> int:
+    """Escreve string com prefixo de tamanho no buffer, retorna o novo offset"""
+    raw = str(text).encode('utf-8')[:255]
+    end = offset + 1 + len(raw)
+    if end > len(buf):
+        raise struct.error("buffer pequeno para o payload binário")
+    buf[offset] = len(raw)
+    buf[offset + 1:end] = raw
+    return end
+
+
+def pack_binary_into(buf: bytearray, offset: int, data: dict[str, Any]) -> int:
+    """
+    Codifica payload no formato binário direto num buffer pré-alocado
+    
+    Mesmo layout de pack_binary(), escrito com struct.pack_into (sem bytes
+    intermediários).
+    
+    Args:
+        buf: Buffer de destino
+        offset: Posição inicial no buffer
+        data: Dicionário com dados de telemetria
+    
+    Returns:
+        Offset logo após o último byte escrito
+    
+    Raises:
+        struct.error: Se o payload não couber no buffer
+    """
+    _BINARY_HEADER.pack_into(buf, offset, BINARY_VERSION, *_quantized_values(data))
+    offset = _pack_str_into(buf, offset + _BINARY_HEADER.size,
+                            data.get("network", {}).get("adapter_name", ""))
+    
+    storage = data.get("storage", [])[:255]
+    _U8.pack_into(buf, offset, len(storage))
+    offset += 1
+    for disk in storage:
+        offset = _pack_str_into(buf, offset, disk.get("name", ""))
+        _STORAGE_RECORD.pack_into(buf, offset, *_storage_values(disk))
+        offset += _STORAGE_RECORD.size
+    
+    fans = data.get("fans", [])[:255]
+    _U8.pack_into(buf, offset, len(fans))
+    offset += 1
+    for fan in fans:
+        offset = _pack_str_into(buf, offset, fan.get("name", ""))
+        _FAN_RECORD.pack_into(buf, offset, _quantize(fan.get("rpm"), 1, 0, 0xFFFF))
+        offset += _FAN_RECORD.size
+    
+    return offset
+
+
+def unpack_binary(data: bytes) -> dict[str, Any]:
+    """
+    Decodifica payload no formato binário (sem magic byte)
+    
+    Args:
+        data: Bytes gerados por pack_binary
+    
+    Returns:
+        Dicionário no mesmo formato do payload JSON
+    
+    Raises:
+        ValueError: Versão desconhecida
+        struct.error / IndexError: Payload truncado
+    """
+    view = memoryview(data)
+    version = view[0]
+    if version == BINARY_VERSION:
+        header_struct, storage_struct, fan_struct = _BINARY_HEADER, _STORAGE_RECORD, _FAN_RECORD
+        scales = [scale for _, _, scale, _, _ in _QUANT_FIELDS]
+        storage_scales = [scale for _, scale in _STORAGE_QUANT]
+    elif version == 1:
+        header_struct, storage_struct, fan_struct = _BINARY_HEADER_V1, _STORAGE_RECORD_V1, _FAN_RECORD_V1
+        scales = [1] * len(BINARY_FIELDS)
+        storage_scales = [1] * len(STORAGE_FIELDS)
+    else:
+        raise ValueError(f"Versão binária desconhecida: {version}")
+    header = header_struct.unpack_from(view, 0)
+    offset = header_struct.size
+    
+    result: dict[str, Any] = {}
+    for (section, key, digits), scale, value in zip(BINARY_FIELDS, scales, header[1:]):
+        value /= scale
+        result.setdefault(section, {})[key] = int(value) if digits is None else round(value, digits)
+    
+    result["network"]["adapter_name"], offset = _unpack_str(view, offset)
+    
+    storage = []
+    count = view[offset]
+    offset += 1
+    for _ in range(count):
+        name, offset = _unpack_str(view, offset)
+        values = storage_struct.unpack_from(view, offset)
+        offset += storage_struct.size
+        disk: dict[str, Any] = {"name": name}
+        disk.update(
+            (k, round(v / scale, 2)) for k, scale, v in zip(STORAGE_FIELDS, storage_scales, values)
+        )
+        storage.append(disk)
+    result["storage"] = storage
+    
+    fans = []
+    count = view[offset]
+    offset += 1
+    for _ in range(count):
+        name, offset = _unpack_str(view, offset)
+        (rpm,) = fan_struct.unpack_from(view, offset)
+        offset += fan_struct.size
+        fans.append({"name": name, "rpm": round(rpm, 0)})
+    result["fans"] = fans
+    
+    return result
+
+
+class StorageReassembler:
+    """
+    Remonta a lista de storage que o sender divide em vários pacotes.
+    
+    Quando o payload passa do MTU, o sender envia antes os fragmentos
+    {"id", "seq", "of", "storage_chunk"} e depois o payload principal com
+    storage vazio e "storage_chunks". Se algum fragmento se perder, o payload
+    usa a última lista completa recebida.
+    """
+    
+    def __init__(self):
+        self._id: Any = None
+        self._parts: dict[int, list[Any]] = {}
+        self._storage: list[Any] = []
+    
+    def feed(self, payload: dict[str, Any]) -> Optional[dict[str, Any]]:
+        """
+        Processa um payload decodificado
+        
+        Returns:
+            Payload pronto para exibição, ou None se era só um fragmento
+        """
+        if "storage_chunk" in payload:
+            if payload.get("id") != self._id:
+                self._id = payload.get("id")
+                self._parts = {}
+            self._parts[payload.get("seq", 0)] = payload["storage_chunk"]
+            if len(self._parts) == payload.get("of", 1):
+                self._storage = [disk for seq in sorted(self._parts) for disk in self._parts[seq]]
+            return None
+        
+        if "storage_chunks" in payload:
+            del payload["storage_chunks"]
+            payload["storage"] = self._storage
+        return payload
+
+
+class DeltaMerger:
+    """
+    Aplica atualizações diferenciais do sender sobre o último snapshot.
+    
+    Payloads com "type": "delta" trazem em "d" só os valores que mudaram desde
+    o último snapshot completo; qualquer outro payload é um snapshot e vira a
+    nova base. O snapshot leva um id em "snap" e cada delta o id da sua base
+    em "base": delta de um snapshot que se perdeu é descartado (em vez de ser
+    aplicado sobre a base anterior).
+    """
+    
+    def __init__(self):
+        self._base: Optional[dict[str, Any]] = None
+        self._snap: Optional[int] = None
+    
+    def feed(self, payload: dict[str, Any]) -> Optional[dict[str, Any]]:
+        """
+        Processa um payload decodificado
+        
+        Returns:
+            Payload completo, ou None se o delta não corresponde ao último
+            snapshot recebido (ou chegou antes do primeiro)
+        """
+        if payload.get("type") != "delta":
+            self._base = payload
+            self._snap = payload.get("snap")
+            return payload
+        if self._base is None or payload.get("base") != self._snap:
+            return None
+        
+        merged = {
+            section: dict(values) if isinstance(values, dict) else values
+            for section, values in self._base.items()
+        }
+        for section, values in payload.get("d", {}).items():
+            if isinstance(values, dict) and isinstance(merged.get(section), dict):
+                merged[section].update(values)
+            else:
+                merged[section] = values
+        return merged
+
+
+def zstd_compress(data: bytes) -> bytes:
+    """
+    Comprime com zstd nível 1 (payload para MagicByte.ZSTD, sem o magic byte)
+    
+    Raises:
+        ValueError: Se zstandard não estiver instalado
+    """
+    if not HAS_ZSTD:
+        raise ValueError("zstandard não está instalado")
+    return _ZSTD_COMPRESSOR.compress(data)
+
+
+def zstd_decompress(data: bytes) -> bytes:
+    """
+    Descomprime um frame zstd (payload com MagicByte.ZSTD, sem o magic byte)
+    
+    Raises:
+        ValueError: Se zstandard não estiver instalado
+    """
+    if not HAS_ZSTD:
+        raise ValueError("payload zstd recebido, mas zstandard não está instalado")
+    return _ZSTD_DECOMPRESSOR.decompress(data)
 
 
 def encode_payload(
     data: dict[str, Any], 
     compress: bool = True,
-    compression_level: int = 6
+    compression_level: int = 6,
+    binary: bool = False,
+    zstd: bool = False
 ) -> bytes:
     """
     Codifica payload para transmissão
@@ -30,11 +425,22 @@ def encode_payload(
         data: Dicionário com dados de telemetria
         compress: Se True, comprime com gzip
         compression_level: Nível de compressão (1-9)
+        binary: Se True, usa o formato binário (ignora compress)
+        zstd: Se True (e zstandard instalado), comprime com zstd nível 1 em vez de gzip
     
     Returns:
         Bytes prontos para envio via socket
     """
-    json_data = json.dumps(data, separators=(',', ':')).encode('utf-8')
+    if binary:
+        return bytes([MagicByte.BINARY]) + pack_binary(data)
+    
+    if HAS_ORJSON:
+        json_data = orjson.dumps(data)
+    else:
+        json_data = json.dumps(data, separators=(',', ':')).encode('utf-8')
+    
+    if compress and zstd and HAS_ZSTD:
+        return bytes([MagicByte.ZSTD]) + _ZSTD_COMPRESSOR.compress(json_data)
     
     if compress:
         compressed = gzip.compress(json_data, compresslevel=compression_level)
@@ -60,8 +466,12 @@ def decode_payload(data: bytes) -> Optional[dict[str, Any]]:
         magic = data[0]
         payload_data = data[1:]
         
-        if magic == MagicByte.GZIP:
+        if magic == MagicByte.BINARY:
+            return unpack_binary(payload_data)
+        elif magic == MagicByte.GZIP:
             json_data = gzip.decompress(payload_data)
+        elif magic == MagicByte.ZSTD:
+            json_data = zstd_decompress(payload_data)
         elif magic == MagicByte.RAW:
             json_data = payload_data
         else:
@@ -72,9 +482,13 @@ def decode_payload(data: bytes) -> Optional[dict[str, Any]]:
             except (gzip.BadGzipFile, OSError):
                 json_data = data
         
-        return json.loads(json_data.decode('utf-8'))
+        # json/orjson aceitam bytes direto (sem cópia intermediária em str)
+        if HAS_ORJSON:
+            return orjson.loads(json_data)
+        return json.loads(json_data)
     
-    except (json.JSONDecodeError, gzip.BadGzipFile, OSError, UnicodeDecodeError) as e:
+    except (json.JSONDecodeError, gzip.BadGzipFile, OSError, UnicodeDecodeError,
+            struct.error, IndexError, ValueError) + _ZSTD_ERRORS as e:
         print(f"[Protocol] Erro ao decodificar payload: {e}")
         return None
 
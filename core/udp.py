@@ -0,0 +1,108 @@
+"""
+Envio UDP em lote (sendmmsg no Linux)
+Compartilhado pelo sender e pelos scripts de teste de rede
+"""
+import ctypes
+import os
+import socket
+import sys
+from typing import Any, Union
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+# Máximo de mensagens por chamada de sendmmsg
+MAX_BATCH = 100
+
+_libc = None
+if sys.platform.startswith("linux"):
+    try:
+        _libc = ctypes.CDLL(None, use_errno=True)
+        _libc.sendmmsg  # glibc >= 2.14
+    except (OSError, AttributeError):
+        _libc = None
+
+if _libc is not None:
+    class _Iovec(ctypes.Structure):
+        _fields_ = [("iov_base", ctypes.c_void_p), ("iov_len", ctypes.c_size_t)]
+
+    class _SockaddrIn(ctypes.Structure):
+        _fields_ = [("sin_family", ctypes.c_ushort), ("sin_port", ctypes.c_uint16),
+                    ("sin_addr", ctypes.c_ubyte * 4), ("sin_zero", ctypes.c_ubyte * 8)]
+
+    class _Msghdr(ctypes.Structure):
+        _fields_ = [("msg_name", ctypes.c_void_p), ("msg_namelen", ctypes.c_uint32),
+                    ("msg_iov", ctypes.POINTER(_Iovec)), ("msg_iovlen", ctypes.c_size_t),
+                    ("msg_control", ctypes.c_void_p), ("msg_controllen", ctypes.c_size_t),
+                    ("msg_flags", ctypes.c_int)]
+
+    class _Mmsghdr(ctypes.Structure):
+        _fields_ = [("msg_hdr", _Msghdr), ("msg_len", ctypes.c_uint)]
+
+    _libc.sendmmsg.argtypes = [ctypes.c_int, ctypes.POINTER(_Mmsghdr), ctypes.c_uint, ctypes.c_int]
+    _libc.sendmmsg.restype = ctypes.c_int
+
+# sockaddr_in por destino (montado uma vez só)
+_sockaddr_cache: dict[tuple[str, int], Any] = {}
+
+
+def _sockaddr(addr: tuple[str, int]):
+    sa = _sockaddr_cache.get(addr)
+    if sa is None:
+        # gethostbyname: IP numérico volta igual; hostname é resolvido (uma vez, cacheado)
+        ip = socket.inet_aton(socket.gethostbyname(addr[0]))
+        sa = _SockaddrIn(socket.AF_INET, socket.htons(addr[1]),
+                         (ctypes.c_ubyte * 4).from_buffer_copy(ip))
+        _sockaddr_cache[addr] = sa
+    return sa
+
+
+def _sendmmsg(sock: socket.socket, packets: list[tuple[Buffer, tuple[str, int]]]) -> int:
+    """Uma chamada sendmmsg(2) para até MAX_BATCH datagramas."""
+    n = len(packets)
+    msgs = (_Mmsghdr * n)()
+    iovs = (_Iovec * n)()
+    refs = []  # mantém os buffers vivos durante a syscall
+    for i, (packet, addr) in enumerate(packets):
+        if isinstance(packet, bytes):
+            buf = ctypes.c_char_p(packet)
+        else:  # memoryview/bytearray (buffer de envio)
+            buf = (ctypes.c_char * len(packet)).from_buffer(packet)
+        refs.append(buf)
+        iovs[i].iov_base = ctypes.cast(buf, ctypes.c_void_p)
+        iovs[i].iov_len = len(packet)
+        sa = _sockaddr(addr)
+        hdr = msgs[i].msg_hdr
+        hdr.msg_name = ctypes.addressof(sa)
+        hdr.msg_namelen = ctypes.sizeof(sa)
+        hdr.msg_iov = ctypes.pointer(iovs[i])
+        hdr.msg_iovlen = 1
+    
+    sent = _libc.sendmmsg(sock.fileno(), msgs, n, 0)
+    if sent < 0:
+        err = ctypes.get_errno()
+        raise OSError(err, os.strerror(err))
+    
+    total = sum(msgs[i].msg_len for i in range(sent))
+    # Envio parcial: o restante vai um a um
+    for packet, addr in packets[sent:]:
+        total += sock.sendto(packet, addr)
+    return total
+
+
+def send_batch(sock: socket.socket, packets: list[tuple[Buffer, tuple[str, int]]]) -> int:
+    """
+    Envia vários datagramas (pacote, destino) de uma vez.
+    
+    No Linux usa sendmmsg(2): uma syscall para até MAX_BATCH mensagens.
+    Nos demais sistemas (ou com um único pacote) cai para um laço de sendto.
+    
+    Returns:
+        Total de bytes enviados
+    """
+    if _libc is None or len(packets) < 2:
+        return sum(sock.sendto(packet, addr) for packet, addr in packets)
+    
+    total = 0
+    for start in range(0, len(packets), MAX_BATCH):
+        total += _sendmmsg(sock, packets[start:start + MAX_BATCH])
+    return total
@@ -24,6 +24,7 @@ from tkinter import ttk
 from tkinter import font as tkfont
 from collections import deque
 import threading
+import queue
 import time
 from datetime import datetime
 from typing import Optional, Any, Deque
@@ -56,6 +57,12 @@ try:
 except ImportError:
     HAS_SOUND_MODULE = False
 
+try:
+    from core.protocol import DeltaMerger, MagicByte, StorageReassembler, unpack_binary, zstd_decompress
+    HAS_PROTOCOL_MODULE = True
+except ImportError:
+    HAS_PROTOCOL_MODULE = False
+
 
 # ========== CONFIGURAÇÕES ==========
 CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "receiver_config.json")
@@ -202,6 +209,9 @@ class TelemetryDashboard:
         # Dados (encapsulados na classe)
         self.current_data = {}
         self.data_lock = threading.Lock()
+        self._storage_parts = StorageReassembler() if HAS_PROTOCOL_MODULE else None
+        self._deltas = DeltaMerger() if HAS_PROTOCOL_MODULE else None
+        self._packets: queue.SimpleQueue = queue.SimpleQueue()  # (addr, bytes) recebidos
         self.history = {
             "cpu_usage": deque([0]*HISTORY_SIZE, maxlen=HISTORY_SIZE),
             "cpu_temp": deque([0]*HISTORY_SIZE, maxlen=HISTORY_SIZE),
@@ -296,7 +306,9 @@ class TelemetryDashboard:
         # Binds de teclado
         self._bind_keys()
         
-        # Inicia thread de recebimento
+        # Inicia threads de recebimento e de decodificação
+        self.decode_thread = threading.Thread(target=self._decode_loop, daemon=True)
+        self.decode_thread.start()
         self.recv_thread = threading.Thread(target=self._receiver_loop, daemon=True)
         self.recv_thread.start()
         
@@ -440,49 +452,14 @@ class TelemetryDashboard:
                     try:
                         data, addr = sock.recvfrom(16384)
                         
-                        # Debug: mostrar de onde veio o pacote
-                        print(f"[Receiver] Pacote recebido de {addr[0]}:{addr[1]} ({len(data)} bytes)")
-                        
                         # Se modo manual, filtra por IP
                         if self.sender_ip and addr[0] != self.sender_ip:
                             print(f"[Receiver] Ignorando pacote de {addr[0]} (esperado: {self.sender_ip})")
                             continue
                         
-                        # Magic byte: 0x01 = gzip, 0x00 = raw JSON
-                        # Retrocompatível: se não começar com 0x00 ou 0x01, tenta gzip
-                        if len(data) > 0:
-                            magic = data[0]
-                            if magic == 0x01:  # GZIP
-                                data = gzip.decompress(data[1:])
-                            elif magic == 0x00:  # Raw JSON
-                                data = data[1:]
-                            else:
-                                # Retrocompatibilidade: sem magic byte
-                                try:
-                                    data = gzip.decompress(data)
-                                except:
-                                    pass
-                        
-                        payload = json.loads(data.decode())
+                        # Descompressão/parse ficam na thread de decodificação
+                        self._packets.put((addr, data))
                         
-                        # Debug: confirmar que o payload foi parseado
-                        cpu_usage = payload.get("cpu", {}).get("usage", 0)
-                        print(f"[Receiver] Payload OK - CPU: {cpu_usage}%")
-                        
-                        with self.data_lock:
-                            self.current_data = payload
-                            self.last_data_time = time.time()
-                            
-                            # Atualiza históricos
-                            self.history["cpu_usage"].append(payload.get("cpu", {}).get("usage", 0))
-                            self.history["cpu_temp"].append(payload.get("cpu", {}).get("temp", 0))
-                            self.history["gpu_load"].append(payload.get("gpu", {}).get("load", 0))
-                            self.history["gpu_temp"].append(payload.get("gpu", {}).get("temp", 0))
-                            self.history["ram"].append(payload.get("ram", {}).get("percent", 0))
-                            self.history["net_down"].append(payload.get("network", {}).get("down_kbps", 0))
-                            self.history["net_up"].append(payload.get("network", {}).get("up_kbps", 0))
-                            self.history["ping"].append(payload.get("network", {}).get("ping_ms", 0))
-                            
                     except socket.timeout:
                         continue
                     except Exception as e:
@@ -495,6 +472,77 @@ class TelemetryDashboard:
                 print(f"[Receiver] Erro ao criar socket: {e}")
                 time.sleep(2)
     
+    def _decode_loop(self):
+        """Thread que descomprime e interpreta os pacotes recebidos (fora do recvfrom)."""
+        while True:
+            addr, data = self._packets.get()
+            try:
+                # Debug: mostrar de onde veio o pacote
+                print(f"[Receiver] Pacote recebido de {addr[0]}:{addr[1]} ({len(data)} bytes)")
+                
+                # Magic byte: 0x01 = gzip, 0x00 = raw JSON, 0x04 = binário, 0x05 = zstd
+                # Retrocompatível: se não começar com magic conhecido, tenta gzip
+                payload = None
+                if len(data) > 0:
+                    magic = data[0]
+                    if magic == 0x01:  # GZIP
+                        data = gzip.decompress(data[1:])
+                    elif magic == 0x00:  # Raw JSON
+                        data = data[1:]
+                    elif HAS_PROTOCOL_MODULE and magic == MagicByte.ZSTD:
+                        data = zstd_decompress(data[1:])
+                    elif HAS_PROTOCOL_MODULE and magic == MagicByte.BINARY:
+                        payload = unpack_binary(data[1:])
+                    else:
+                        # Retrocompatibilidade: sem magic byte
+                        try:
+                            data = gzip.decompress(data)
+                        except:
+                            pass
+                
+                if payload is None:
+                    payload = json.loads(data)
+                
+                # Storage dividido em vários pacotes (payload acima do MTU)
+                if HAS_PROTOCOL_MODULE:
+                    payload = self._storage_parts.feed(payload)
+                elif "storage_chunk" in payload:
+                    payload = None
+                if payload is None:
+                    continue
+                
+                # Lote de amostras (sender com lote_ms > 0): a última vira o estado atual
+                samples = payload["samples"] if "samples" in payload else (payload,)
+                
+                # Atualização diferencial (sender com delta_a_cada > 0): completa com o snapshot
+                if HAS_PROTOCOL_MODULE:
+                    samples = [s for s in map(self._deltas.feed, samples) if s is not None]
+                else:
+                    samples = [s for s in samples if s.get("type") != "delta"]
+                if not samples:
+                    continue
+                
+                # Debug: confirmar que o payload foi parseado
+                cpu_usage = samples[-1].get("cpu", {}).get("usage", 0)
+                print(f"[Receiver] Payload OK - CPU: {cpu_usage}%")
+                
+                with self.data_lock:
+                    self.current_data = samples[-1]
+                    self.last_data_time = time.time()
+                    
+                    # Atualiza históricos
+                    for payload in samples:
+                        self.history["cpu_usage"].append(payload.get("cpu", {}).get("usage", 0))
+                        self.history["cpu_temp"].append(payload.get("cpu", {}).get("temp", 0))
+                        self.history["gpu_load"].append(payload.get("gpu", {}).get("load", 0))
+                        self.history["gpu_temp"].append(payload.get("gpu", {}).get("temp", 0))
+                        self.history["ram"].append(payload.get("ram", {}).get("percent", 0))
+                        self.history["net_down"].append(payload.get("network", {}).get("down_kbps", 0))
+                        self.history["net_up"].append(payload.get("network", {}).get("up_kbps", 0))
+                        self.history["ping"].append(payload.get("network", {}).get("ping_ms", 0))
+            except Exception as e:
+                print(f"[Receiver] Erro: {e}")
+    
     def _update_value(self, panel, key, label, value, unit="", warn_threshold=None, crit_threshold=None):
         """Atualiza ou cria um valor em um painel."""
         if key not in panel["labels"]:
@@ -16,8 +16,15 @@ import sys
 import os
 import gzip
 import ctypes
+import functools
+import logging
 import threading
-from typing import Optional, Any
+import select
+import queue
+import struct
+from typing import Optional, Any, Union
+
+Buffer = Union[bytes, bytearray, memoryview]
 
 # ========== AUTO-ELEVAÇÃO PARA ADMINISTRADOR ==========
 def is_admin():
@@ -42,6 +49,12 @@ def run_as_admin():
 # Argumento --no-admin para desativar elevação (para debug)
 SKIP_ADMIN = "--no-admin" in sys.argv
 
+# Log por pacote fica em DEBUG (silencioso); --debug liga no console
+log = logging.getLogger("telemetria.sender")
+log.addHandler(logging.NullHandler())
+if "--debug" in sys.argv:
+    logging.basicConfig(level=logging.DEBUG, format="%(message)s")
+
 if not SKIP_ADMIN and not is_admin():
     print("=" * 50)
     print("ELEVANDO PRIVILÉGIOS PARA ADMINISTRADOR...")
@@ -67,48 +80,86 @@ except ImportError:
     HAS_TRAY = False
     print("[Aviso] pystray/PIL não instalados. System tray desativado.")
 
+# Serialização JSON rápida (orjson gera bytes direto em C)
+try:
+    import orjson
+    _dumps = orjson.dumps
+except ImportError:
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
+# Protocolo compartilhado (formato binário)
+try:
+    from core.protocol import HAS_ZSTD, MagicByte, pack_binary, pack_binary_into, zstd_compress
+    HAS_PROTOCOL_MODULE = True
+except ImportError:
+    HAS_PROTOCOL_MODULE = False
+    HAS_ZSTD = False
+
 
 # ========== CONFIGURAÇÕES ==========
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.json")
+
+CONFIG_PADRAO = {
+    "modo": "broadcast",
+    "dest_ip": "255.255.255.255",
+    "porta": 5005,
+    "intervalo": 0.5,
+    "bind_ip": "",  # IP local para enviar (vazio = auto)
+    "formato": "json",  # "json" ou "binario"
+    "compressao": "gzip",  # JSON comprimido com "gzip" ou "zstd" (requer zstandard nos dois lados)
+    "destinos_extras": [],  # IPs adicionais (unicast) que recebem cópia de cada pacote
+    "lote_ms": 0,  # agrupa amostras por N ms num só pacote (0 = um pacote por amostra)
+    "delta_a_cada": 0  # snapshot completo a cada N envios, só mudanças entre eles (0 = sempre completo)
+}
+
+
+@functools.lru_cache(maxsize=1)
+def _ler_config(config_path: str, mtime: float) -> dict[str, Any]:
+    """Lê config.json e completa com padrões (cacheado por caminho + mtime)."""
+    with open(config_path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    for key in CONFIG_PADRAO:
+        if key not in config:
+            config[key] = CONFIG_PADRAO[key]
+    print(f"[Config] Carregado de {config_path}")
+    return config
+
+
 def carregar_config():
-    """Carrega configurações do config.json ou usa padrões."""
-    config_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.json")
-    
-    config_padrao = {
-        "modo": "broadcast",
-        "dest_ip": "255.255.255.255",
-        "porta": 5005,
-        "intervalo": 0.5,
-        "bind_ip": ""  # IP local para enviar (vazio = auto)
-    }
-    
-    if os.path.exists(config_path):
+    """
+    Carrega configurações do config.json ou usa padrões.
+    
+    A leitura só acontece de novo se o arquivo mudar (mtime), então chamar
+    esta função repetidamente não faz I/O.
+    """
+    if os.path.exists(CONFIG_PATH):
         try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-                for key in config_padrao:
-                    if key not in config:
-                        config[key] = config_padrao[key]
-                print(f"[Config] Carregado de {config_path}")
-                return config
+            return dict(_ler_config(CONFIG_PATH, os.path.getmtime(CONFIG_PATH)))
         except Exception as e:
             print(f"[Config] Erro: {e}")
     else:
         try:
-            with open(config_path, 'w', encoding='utf-8') as f:
+            with open(CONFIG_PATH, 'w', encoding='utf-8') as f:
                 json.dump({
-                    **config_padrao,
+                    **CONFIG_PADRAO,
                     "comentarios": {
                         "modo": "Opções: 'broadcast' ou 'unicast'",
                         "dest_ip": "IP do notebook (ignorado em broadcast)",
                         "porta": "Porta UDP",
-                        "intervalo": "Segundos entre envios"
+                        "intervalo": "Segundos entre envios",
+                        "formato": "Opções: 'json' (gzip) ou 'binario' (struct compacto)",
+                        "compressao": "Opções: 'gzip' ou 'zstd' (mais rápido; o receptor precisa do zstandard)",
+                        "destinos_extras": "Lista de IPs extras que também recebem os pacotes",
+                        "lote_ms": "Agrupa amostras por N ms num só pacote (0 = desativado)",
+                        "delta_a_cada": "Envia snapshot completo a cada N pacotes e só as mudanças entre eles (0 = desativado)"
                     }
                 }, f, indent=4, ensure_ascii=False)
             print(f"[Config] Criado config.json padrão")
         except:
             pass
     
-    return config_padrao
+    return dict(CONFIG_PADRAO)
 
 CONFIG = carregar_config()
 DEST_IP = CONFIG["dest_ip"]
@@ -116,25 +167,233 @@ PORTA = CONFIG["porta"]
 INTERVALO = CONFIG["intervalo"]
 MODO = CONFIG["modo"]
 BIND_IP = CONFIG.get("bind_ip", "")  # IP local para bind
+FORMATO = CONFIG.get("formato", "json")
+COMPRESSAO = CONFIG.get("compressao", "gzip")
+DESTINOS_EXTRAS = [ip for ip in CONFIG.get("destinos_extras", []) if ip]
+LOTE_MS = CONFIG.get("lote_ms", 0)
+DELTA_A_CADA = CONFIG.get("delta_a_cada", 0)
+
+# Buffer de envio do socket UDP (absorve rajadas sem descarte no kernel)
+SNDBUF_BYTES = 1 << 20  # 1 MiB
+
+# Tamanho máximo de um datagrama (abaixo do MTU Ethernet, sem fragmentação IP)
+MAX_DATAGRAM = 1400
+
+# Tamanho (JSON) a partir do qual um lote de amostras é enviado antes do prazo
+BATCH_FLUSH_BYTES = 1300
+
+# JSON menor que isso vai sem compressão (gzip não compensa o custo de CPU)
+COMPRESS_MIN_BYTES = 512
+
+# Tamanho inicial do buffer de envio reutilizável (cresce se preciso)
+SEND_BUF_SIZE = 2048
+
+# Resumo no console a cada N envios (em vez de um print por pacote)
+SUMMARY_EVERY = 20
+
+# Ping medido em thread separada (o loop de envio só lê o último valor)
+PING_INTERVAL = 5.0  # segundos entre medições
+PING_TIMEOUT = 1.0   # segundos até considerar o host inacessível
+HAS_POLL = hasattr(select, "poll")  # indisponível no Windows
 # ==========================================
 
 
+# Funções chamadas a cada ciclo (evita a busca de atributo no módulo)
+_monotonic_ns = time.monotonic_ns
+_cpu_percent = psutil.cpu_percent
+_virtual_memory = psutil.virtual_memory
+_net_io_counters = psutil.net_io_counters
+
+
+# ========== SERIALIZAÇÃO JSON (esquema fixo) ==========
+# O payload tem sempre as mesmas chaves: o JSON é montado sobre um template
+# de bytes e só os valores são interpolados (%a = repr, igual ao json.dumps
+# para int/float). Listas e strings passam pelo serializador normal.
+_JSON_TEMPLATE = (
+    b'{"cpu":{"usage":%a,"temp":%a,"voltage":%a,"power":%a,"clock":%a},'
+    b'"gpu":{"load":%a,"temp":%a,"voltage":%a,"clock_core":%a,"clock_mem":%a,'
+    b'"fan":%a,"mem_used_mb":%a},'
+    b'"mobo":{"temp":%a},'
+    b'"ram":{"percent":%a,"used_gb":%a,"total_gb":%a},'
+    b'"storage":%b,"fans":%b,'
+    b'"network":{"down_kbps":%a,"up_kbps":%a,"ping_ms":%a,"link_speed_mbps":%a,'
+    b'"adapter_name":%b}}'
+)
+
+
+def _dumps_payload(payload: dict[str, Any], snap: Optional[int] = None) -> bytes:
+    """
+    Serializa o payload do sender para JSON usando o template fixo.
+    
+    Com snap (modo delta), o snapshot leva o id em "snap" para o receiver
+    casar os deltas seguintes com esta base.
+    """
+    cpu, gpu, ram, net = payload["cpu"], payload["gpu"], payload["ram"], payload["network"]
+    data = _JSON_TEMPLATE % (
+        cpu["usage"], cpu["temp"], cpu["voltage"], cpu["power"], cpu["clock"],
+        gpu["load"], gpu["temp"], gpu["voltage"], gpu["clock_core"], gpu["clock_mem"],
+        gpu["fan"], gpu["mem_used_mb"],
+        payload["mobo"]["temp"],
+        ram["percent"], ram["used_gb"], ram["total_gb"],
+        _dumps(payload["storage"]), _dumps(payload["fans"]),
+        net["down_kbps"], net["up_kbps"], net["ping_ms"], net["link_speed_mbps"],
+        _dumps(net["adapter_name"]),
+    )
+    if snap is not None:
+        data = data[:-1] + b',"snap":%d}' % snap
+    return data
+# ======================================================
+
+
+# ========== ENVIO EM LOTE (sendmmsg) ==========
+try:
+    from core.udp import send_batch
+except ImportError:
+    def send_batch(sock: socket.socket, packets: list[tuple[Buffer, tuple[str, int]]]) -> int:
+        """Envia vários datagramas (pacote, destino) com um laço de sendto."""
+        return sum(sock.sendto(packet, addr) for packet, addr in packets)
+
+# libc (Linux): timerfd
+_libc = None
+if sys.platform.startswith("linux"):
+    try:
+        _libc = ctypes.CDLL(None, use_errno=True)
+    except OSError:
+        _libc = None
+# ==============================================
+
+
+# ========== CADÊNCIA (timerfd) ==========
+CLOCK_MONOTONIC = 1
+TFD_CLOEXEC = 0o2000000
+
+HAS_TIMERFD = _libc is not None and hasattr(_libc, "timerfd_create")
+
+if HAS_TIMERFD:
+    class _Timespec(ctypes.Structure):
+        _fields_ = [("tv_sec", ctypes.c_long), ("tv_nsec", ctypes.c_long)]
+
+    class _Itimerspec(ctypes.Structure):
+        _fields_ = [("it_interval", _Timespec), ("it_value", _Timespec)]
+
+    _libc.timerfd_settime.argtypes = [ctypes.c_int, ctypes.c_int,
+                                      ctypes.POINTER(_Itimerspec), ctypes.c_void_p]
+
+
+class TimerFd:
+    """
+    Timer periódico do kernel (Linux).
+    
+    O timerfd dispara a cada intervalo independente do tempo gasto no ciclo,
+    sem o jitter de um sleep calculado em Python.
+    """
+    
+    def __init__(self, interval: float):
+        self.fd = _libc.timerfd_create(CLOCK_MONOTONIC, TFD_CLOEXEC)
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self._arm(interval, interval)
+    
+    def _arm(self, first: float, interval: float):
+        spec = _Itimerspec()
+        spec.it_value.tv_sec, spec.it_value.tv_nsec = divmod(max(int(first * 1e9), 1), 1_000_000_000)
+        spec.it_interval.tv_sec, spec.it_interval.tv_nsec = divmod(int(interval * 1e9), 1_000_000_000)
+        if _libc.timerfd_settime(self.fd, 0, ctypes.byref(spec), None) < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+    
+    def wait(self) -> int:
+        """Bloqueia até o próximo disparo. Retorna quantos disparos ocorreram."""
+        return int.from_bytes(os.read(self.fd, 8), sys.byteorder)
+    
+    def wake(self):
+        """Dispara imediatamente (desbloqueia wait() para encerrar)."""
+        self._arm(0, 0)
+    
+    def close(self):
+        os.close(self.fd)
+# ========================================
+
+
 class TelemetrySender:
     """Sender de telemetria com suporte a System Tray."""
     
     def __init__(self):
         self.running = True
         self.paused = False
+        self._shutdown = threading.Event()
         self.monitor = None
         self.sock = None
         self.icon = None
         self.last_net = None
-        self.last_t = None
+        self.last_t_ns = None
         
         # Cache para link de rede (evita chamar PowerShell a cada ciclo)
         self.cached_link_info: dict = {"link_speed_mbps": 0, "adapter_name": ""}
-        self.last_link_check: float = 0
-        self.LINK_CHECK_INTERVAL: float = 10.0  # Verificar apenas a cada 10 segundos
+        self.last_link_check_ns: Optional[int] = None
+        self.LINK_CHECK_INTERVAL_NS: int = 10_000_000_000  # Verificar apenas a cada 10 segundos
+        
+        # Destino pré-calculado e já resolvido (evita montar a tupla e o DNS a cada envio;
+        # sendmmsg precisa do IP numérico)
+        try:
+            self._dest = (socket.gethostbyname(DEST_IP), PORTA)
+        except OSError as e:
+            print(f"[Socket] Não foi possível resolver {DEST_IP}: {e}")
+            self._dest = (DEST_IP, PORTA)
+        self._connected = False
+        
+        # Receivers adicionais: cada pacote é replicado via send_batch
+        self._dests = [self._dest]
+        for ip in DESTINOS_EXTRAS:
+            try:
+                self._dests.append((socket.gethostbyname(ip), PORTA))
+            except OSError as e:
+                print(f"[Socket] Destino extra ignorado ({ip}): {e}")
+        
+        # Timer de cadência (Linux, criado no início do loop de envio)
+        self._timer: Optional[TimerFd] = None
+        
+        # Amostras da thread de medição para a thread de envio (None = encerrar)
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        
+        # Lote de amostras (lote_ms > 0): um datagrama {"samples": [...]} por janela
+        self._lote_s = LOTE_MS / 1000
+        self._pending: list[bytes] = []
+        self._pending_size = 0
+        self._last_flush = time.monotonic()
+        
+        # Atualização diferencial (delta_a_cada > 0): snapshot completo a cada N envios
+        self._delta_every = DELTA_A_CADA
+        self._delta_count = 0
+        self._delta_base: dict[str, Any] = {}
+        self._snap_id = 0  # id do snapshot-base, repetido em cada delta
+        
+        # Último ping medido pela thread de ping (ms, 0 = sem resposta)
+        self.latest_ping = 0
+        
+        # Buffer de envio reutilizado (magic byte + dados)
+        self._send_buf = bytearray(SEND_BUF_SIZE)
+        
+        # Payload reutilizado entre ciclos (mutado in-place)
+        self._payload = self._novo_payload()
+        # RAM total não muda: calculada uma vez
+        self._payload["ram"]["total_gb"] = round(psutil.virtual_memory().total / (1024**3), 2)
+        
+        # Contadores para o resumo periódico
+        self._msg_count = 0
+        self._byte_count = 0
+        self._backlog = 0  # amostras que esperaram na fila (envio atrasado)
+        
+        # Formato binário requer core.protocol (compartilhado com o receiver)
+        self._binary = FORMATO == "binario" and HAS_PROTOCOL_MODULE
+        if FORMATO == "binario" and not HAS_PROTOCOL_MODULE:
+            print("[Sender] core.protocol não encontrado. Usando JSON.")
+        
+        # zstd: descompressão mais barata no receptor que gzip
+        self._zstd = COMPRESSAO == "zstd" and HAS_ZSTD
+        if COMPRESSAO == "zstd" and not HAS_ZSTD:
+            print("[Sender] zstandard não instalado. Usando gzip.")
         
         # Inicializa socket
         self._init_socket()
@@ -143,14 +402,16 @@ class TelemetrySender:
         self._init_hardware_monitor()
         
         # Inicializa rede
-        self.last_net = psutil.net_io_counters()
-        self.last_t = time.time()
+        self.last_net = psutil.net_io_counters(nowrap=False)
+        self.last_t_ns = time.monotonic_ns()
     
     def _init_socket(self):
         """Configura socket UDP."""
         self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._tune_socket()
         
-        if MODO == "broadcast" or DEST_IP == "255.255.255.255":
+        broadcast = MODO == "broadcast" or DEST_IP == "255.255.255.255"
+        if broadcast:
             self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
             print("[Socket] Modo BROADCAST ativado")
         else:
@@ -165,6 +426,48 @@ class TelemetrySender:
                 print(f"[Socket] Erro ao bind em {BIND_IP}: {e}")
         else:
             print("[Socket] Usando interface padrão")
+        
+        # Unicast com destino único: fixa o destino no socket
+        # (o kernel não revalida o endereço a cada envio)
+        if len(self._dests) > 1:
+            print(f"[Socket] {len(self._dests) - 1} destino(s) extra(s): {DESTINOS_EXTRAS}")
+        elif not broadcast:
+            try:
+                self.sock.connect(self._dest)
+                self._connected = True
+            except OSError as e:
+                print(f"[Socket] Erro ao conectar em {DEST_IP}:{PORTA}: {e}")
+    
+    def _send(self, packet: Buffer) -> int:
+        """Envia um datagrama para o(s) destino(s) configurado(s)."""
+        if self._connected:
+            try:
+                return self.sock.send(packet)
+            except ConnectionRefusedError:
+                # Socket conectado recebe o ICMP "port unreachable" do envio
+                # anterior: receiver ainda fechado, não é erro do sender
+                log.debug("[Send] Receiver %s:%d recusou (offline?)", DEST_IP, PORTA)
+                return 0
+        if len(self._dests) > 1:
+            return send_batch(self.sock, [(packet, dest) for dest in self._dests])
+        return self.sock.sendto(packet, self._dest)
+    
+    def _tune_socket(self):
+        """Ajusta buffer de envio e prioridade do socket UDP."""
+        try:
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SNDBUF_BYTES)
+        except OSError as e:
+            print(f"[Socket] Erro ao ajustar SO_SNDBUF: {e}")
+        
+        # Linux: classe de fila de baixa latência (6 = interativo)
+        if hasattr(socket, "SO_PRIORITY"):
+            try:
+                self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_PRIORITY, 6)
+            except OSError:
+                pass
+        
+        sndbuf = self.sock.getsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF)
+        print(f"[Socket] SO_SNDBUF efetivo: {sndbuf} bytes")
     
     def _init_hardware_monitor(self):
         """Inicializa LibreHardwareMonitor."""
@@ -188,24 +491,29 @@ class TelemetrySender:
         
         return image
     
-    def _tray_menu(self):
-        """Menu do System Tray."""
+    def _build_menu(self, paused: bool):
+        """Monta o menu do System Tray para um estado (ativo/pausado)."""
         return pystray.Menu(
             pystray.MenuItem("⚡ Telemetria Ativa", lambda: None, enabled=False),
             pystray.Menu.SEPARATOR,
-            pystray.MenuItem("⏸️ Pausar" if not self.paused else "▶️ Retomar", self._toggle_pause),
+            pystray.MenuItem("▶️ Retomar" if paused else "⏸️ Pausar", self._toggle_pause),
             pystray.MenuItem("🔄 Reiniciar Monitor", self._restart_monitor),
             pystray.Menu.SEPARATOR,
             pystray.MenuItem("❌ Encerrar", self._quit)
         )
     
+    def _tray_menu(self):
+        """Menu do System Tray (pré-montado para o estado atual)."""
+        return self._menu_paused if self.paused else self._menu_active
+    
     def _toggle_pause(self, icon=None, item=None):
         """Pausa/retoma o envio."""
         self.paused = not self.paused
         status = "pausado" if self.paused else "ativo"
         print(f"[Sender] {status.upper()}")
         if self.icon:
-            self.icon.update_menu()
+            # O setter de menu do pystray já reconstrói o menu nativo
+            self.icon.menu = self._tray_menu()
     
     def _restart_monitor(self, icon=None, item=None):
         """Reinicia o hardware monitor."""
@@ -221,53 +529,67 @@ class TelemetrySender:
         """Encerra o sender."""
         print("\n[Sender] Encerrando...")
         self.running = False
+        self._shutdown.set()
+        if self._timer is not None:
+            try:
+                self._timer.wake()
+            except OSError:
+                pass
         if self.icon:
             self.icon.stop()
     
-    def _calcular_rede(self):
+    def _calcular_rede(self, now_ns: int):
         """Calcula velocidade de rede."""
-        now = time.time()
-        net_io = psutil.net_io_counters()
-        delta = now - self.last_t
+        net_io = _net_io_counters(nowrap=False)
+        delta = (now_ns - self.last_t_ns) / 1e9
         if delta <= 0:
             delta = 1
         
-        sent = net_io.bytes_sent - self.last_net.bytes_sent
-        recv = net_io.bytes_recv - self.last_net.bytes_recv
+        # nowrap=False pula o controle de overflow do psutil: se um contador
+        # de 32 bits der a volta, o delta negativo daquele ciclo vira 0
+        sent = max(0, net_io.bytes_sent - self.last_net.bytes_sent)
+        recv = max(0, net_io.bytes_recv - self.last_net.bytes_recv)
         
         self.last_net = net_io
-        self.last_t = now
+        self.last_t_ns = now_ns
         
         return (sent/1024)/delta, (recv/1024)/delta
     
     def _medir_ping(self, host="8.8.8.8"):
-        """Mede latência para host externo."""
+        """Mede latência para host externo (connect TCP não bloqueante)."""
+        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         try:
-            t1 = time.time()
-            s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            s.settimeout(1)
-            s.connect((host, 53))
-            s.close()
-            return round((time.time() - t1) * 1000, 1)
-        except:
+            s.setblocking(False)
+            t1 = time.perf_counter()
+            s.connect_ex((host, 53))
+            if HAS_POLL:
+                poller = select.poll()
+                poller.register(s, select.POLLOUT)
+                ready = bool(poller.poll(PING_TIMEOUT * 1000))
+            else:
+                # Windows: sem poll(); conexão recusada chega no conjunto de exceção
+                _, writable, failed = select.select([], [s], [s], PING_TIMEOUT)
+                ready = bool(writable) and not failed
+            if not ready or s.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR):
+                return 0
+            return round((time.perf_counter() - t1) * 1000, 1)
+        except OSError:
             return 0
+        finally:
+            s.close()
     
-    def _build_payload(self, hw_data):
-        """Monta payload de telemetria (unificado)."""
-        cpu_percent = psutil.cpu_percent(interval=None)
-        mem = psutil.virtual_memory()
-        up, down = self._calcular_rede()
-        ping = self._medir_ping()
-        
-        # Valores padrão
-        payload = {
-            "cpu": {
-                "usage": cpu_percent,
-                "temp": 0,
-                "voltage": 0,
-                "power": 0,
-                "clock": 0
-            },
+    def _ping_worker(self):
+        """Thread de ping: mede a cada PING_INTERVAL sem travar o loop de envio."""
+        while not self._shutdown.is_set():
+            if not self.paused:
+                self.latest_ping = self._medir_ping()
+            self._shutdown.wait(PING_INTERVAL)
+    
+    @staticmethod
+    def _novo_payload() -> dict[str, Any]:
+        """Estrutura do payload com valores padrão (criada uma única vez)."""
+        return {
+            "cpu": {"usage": 0, "temp": 0, "voltage": 0, "power": 0, "clock": 0},
             "gpu": {
                 "load": 0,
                 "temp": 0,
@@ -277,115 +599,393 @@ class TelemetrySender:
                 "fan": 0,
                 "mem_used_mb": 0
             },
-            "mobo": {
-                "temp": 0
-            },
-            "ram": {
-                "percent": mem.percent,
-                "used_gb": round(mem.used / (1024**3), 2),
-                "total_gb": round(mem.total / (1024**3), 2)
-            },
+            "mobo": {"temp": 0},
+            "ram": {"percent": 0, "used_gb": 0, "total_gb": 0},
             "storage": [],
             "fans": [],
             "network": {
-                "down_kbps": round(down, 1),
-                "up_kbps": round(up, 1),
-                "ping_ms": ping,
+                "down_kbps": 0,
+                "up_kbps": 0,
+                "ping_ms": 0,
                 "link_speed_mbps": 0,
                 "adapter_name": ""
             }
         }
+    
+    def _coletar(self, hw_data) -> tuple:
+        """
+        Lê as métricas do sistema (roda na thread de medição).
         
-        # Sobrescreve com dados do hardware monitor se disponíveis
-        if hw_data:
-            payload["cpu"]["temp"] = round(hw_data["cpu"]["temp"], 1)
-            payload["cpu"]["voltage"] = round(hw_data["cpu"]["voltage"], 3)
-            payload["cpu"]["power"] = round(hw_data["cpu"]["power"], 1)
-            payload["cpu"]["clock"] = round(hw_data["cpu"]["clock"], 0)
-            
-            payload["gpu"]["load"] = round(hw_data["gpu"]["load"], 1)
-            payload["gpu"]["temp"] = round(hw_data["gpu"]["temp"], 1)
-            payload["gpu"]["voltage"] = round(hw_data["gpu"]["voltage"], 3)
-            payload["gpu"]["clock_core"] = round(hw_data["gpu"]["clock_core"], 0)
-            payload["gpu"]["clock_mem"] = round(hw_data["gpu"]["clock_mem"], 0)
-            payload["gpu"]["fan"] = round(hw_data["gpu"]["fan"], 0)
-            payload["gpu"]["mem_used_mb"] = round(hw_data["gpu"]["mem_used"], 0)
-            
-            payload["mobo"]["temp"] = round(hw_data["mobo"]["temp"], 1)
-            payload["storage"] = hw_data["storage"]
-            payload["fans"] = hw_data["fans"]
+        Returns:
+            Amostra (cpu_percent, mem, up, down, ping, hw_data, link_info)
+        """
+        # Um único relógio monotônico por ciclo (imune a ajustes de NTP)
+        now_ns = _monotonic_ns()
+        cpu_percent = _cpu_percent(interval=None)
+        mem = _virtual_memory()
+        up, down = self._calcular_rede(now_ns)
+        ping = self.latest_ping  # atualizado pela thread de ping
         
         # Obter informações do adaptador de rede (velocidade do link) COM CACHE
         # A velocidade do link não muda frequentemente, só quando desconecta o cabo
+        link_info = None
         if self.monitor and self.monitor.enabled:
             try:
-                current_time = time.time()
                 # Só chama o PowerShell se passou o tempo do intervalo
-                if current_time - self.last_link_check > self.LINK_CHECK_INTERVAL:
+                if (self.last_link_check_ns is None or
+                        now_ns - self.last_link_check_ns > self.LINK_CHECK_INTERVAL_NS):
                     self.cached_link_info = self.monitor.get_network_link_info()
-                    self.last_link_check = current_time
-                
-                # Usa os dados cacheados
-                payload["network"]["link_speed_mbps"] = self.cached_link_info.get("link_speed_mbps", 0)
-                payload["network"]["adapter_name"] = self.cached_link_info.get("adapter_name", "")
+                    self.last_link_check_ns = now_ns
+                link_info = self.cached_link_info
             except Exception:
                 pass
         
+        return cpu_percent, mem, up, down, ping, hw_data, link_info
+    
+    def _build_payload(self, sample: tuple):
+        """
+        Monta payload de telemetria (unificado) a partir de uma amostra.
+        
+        Reaproveita o mesmo dicionário a cada ciclo, só atualizando os valores
+        (sem recriar ~30 chaves por envio). O retorno é válido até a próxima chamada.
+        """
+        cpu_percent, mem, up, down, ping, hw_data, link_info = sample
+        
+        payload = self._payload
+        cpu, gpu, ram, net = payload["cpu"], payload["gpu"], payload["ram"], payload["network"]
+        
+        cpu["usage"] = cpu_percent
+        ram["percent"] = mem.percent
+        ram["used_gb"] = round(mem.used / (1024**3), 2)
+        net["down_kbps"] = round(down, 1)
+        net["up_kbps"] = round(up, 1)
+        net["ping_ms"] = ping
+        
+        # Sobrescreve com dados do hardware monitor se disponíveis
+        storage, fans = payload["storage"], payload["fans"]
+        storage.clear()
+        fans.clear()
+        if hw_data:
+            hw_cpu, hw_gpu = hw_data["cpu"], hw_data["gpu"]
+            cpu["temp"] = round(hw_cpu["temp"], 1)
+            cpu["voltage"] = round(hw_cpu["voltage"], 3)
+            cpu["power"] = round(hw_cpu["power"], 1)
+            cpu["clock"] = round(hw_cpu["clock"], 0)
+            
+            gpu["load"] = round(hw_gpu["load"], 1)
+            gpu["temp"] = round(hw_gpu["temp"], 1)
+            gpu["voltage"] = round(hw_gpu["voltage"], 3)
+            gpu["clock_core"] = round(hw_gpu["clock_core"], 0)
+            gpu["clock_mem"] = round(hw_gpu["clock_mem"], 0)
+            gpu["fan"] = round(hw_gpu["fan"], 0)
+            gpu["mem_used_mb"] = round(hw_gpu["mem_used"], 0)
+            
+            payload["mobo"]["temp"] = round(hw_data["mobo"]["temp"], 1)
+            storage.extend(hw_data["storage"])
+            fans.extend(hw_data["fans"])
+        else:
+            for key in ("temp", "voltage", "power", "clock"):
+                cpu[key] = 0
+            for key in gpu:
+                gpu[key] = 0
+            payload["mobo"]["temp"] = 0
+        
+        # Usa os dados cacheados do adaptador de rede
+        if link_info is not None:
+            net["link_speed_mbps"] = link_info.get("link_speed_mbps", 0)
+            net["adapter_name"] = link_info.get("adapter_name", "")
+        
         return payload
     
+    def _frame(self, magic: int, data: bytes) -> memoryview:
+        """Copia magic byte + dados para o buffer de envio reutilizável."""
+        n = len(data) + 1
+        if n > len(self._send_buf):
+            # Buffer novo (não redimensiona: o memoryview anterior pode estar vivo)
+            self._send_buf = bytearray(max(n, 2 * len(self._send_buf)))
+        buf = self._send_buf
+        buf[0] = magic
+        buf[1:n] = data
+        return memoryview(buf)[:n]
+    
+    def _encode(self, payload: dict[str, Any], snap: Optional[int] = None) -> tuple[memoryview, str]:
+        """
+        Serializa payload com magic byte. Retorna (pacote, encoding).
+        
+        snap: id do snapshot no modo delta (só JSON; o binário não tem delta).
+        
+        O pacote é uma view do buffer de envio: válido até a próxima chamada.
+        """
+        # Formato binário: struct compacto, dispensa compressão
+        if self._binary:
+            buf = self._send_buf
+            try:
+                # Escreve direto no buffer de envio (struct.pack_into)
+                buf[0] = MagicByte.BINARY
+                end = pack_binary_into(buf, 1, payload)
+                return memoryview(buf)[:end], "binario"
+            except struct.error:
+                # Não coube: _frame aloca um buffer maior
+                return self._frame(MagicByte.BINARY, pack_binary(payload)), "binario"
+        
+        return self._encode_json(_dumps_payload(payload, snap))
+    
+    def _encode_json(self, data: bytes) -> tuple[memoryview, str]:
+        """Enquadra JSON já serializado: gzip/zstd se ficar menor, senão raw."""
+        if len(data) < COMPRESS_MIN_BYTES:
+            return self._frame(0x00, data), "raw"
+        
+        # Magic byte: 0x01 = gzip, 0x05 = zstd, 0x00 = raw JSON
+        if self._zstd:
+            compressed = zstd_compress(data)
+            if len(compressed) < len(data):
+                return self._frame(MagicByte.ZSTD, compressed), "zstd"
+            return self._frame(0x00, data), "raw"
+        
+        compressed = gzip.compress(data)
+        if len(compressed) < len(data):
+            return self._frame(0x01, compressed), "gzip"
+        return self._frame(0x00, data), "raw"
+    
+    def _split_storage(self, payload: dict[str, Any], snap: Optional[int] = None):
+        """
+        Divide a lista de storage em pacotes de até MAX_DATAGRAM bytes.
+        
+        Envia primeiro {"id", "seq", "of", "storage_chunk"} e por último o payload
+        com storage vazio e "storage_chunks" (o receiver remonta a lista).
+        Cada item é um pacote (view do buffer de envio): enviar antes do próximo.
+        """
+        chunks: list[list[Any]] = [[]]
+        size = 0
+        for disk in payload["storage"]:
+            n = len(_dumps(disk)) + 1
+            if chunks[-1] and size + n > MAX_DATAGRAM - 64:
+                chunks.append([])
+                size = 0
+            chunks[-1].append(disk)
+            size += n
+        
+        msg_id = self._msg_count
+        for seq, chunk in enumerate(chunks):
+            yield self._encode_json(_dumps({
+                "id": msg_id, "seq": seq, "of": len(chunks), "storage_chunk": chunk
+            }))
+        last = {**payload, "storage": [], "storage_chunks": {"id": msg_id, "of": len(chunks)}}
+        if snap is not None:
+            last["snap"] = snap
+        yield self._encode_json(_dumps(last))
+    
     def _sender_loop(self):
-        """Loop principal de coleta e envio."""
+        """Loop principal de coleta (o envio fica com _send_worker)."""
         print(f"\n{'='*50}")
         print("   SENTINELA DE TELEMETRIA - ATIVO")
         print(f"{'='*50}")
         print(f"Destino: {'BROADCAST' if MODO == 'broadcast' else DEST_IP}:{PORTA}")
         print(f"Intervalo: {INTERVALO}s")
+        print(f"Formato: {'BINÁRIO' if self._binary else 'JSON'}")
         print(f"{'='*50}\n")
         
         # Primeira leitura de CPU (prepara o contador)
         psutil.cpu_percent(interval=None)
         
+        # Linux: cadência pelo timerfd; demais: deadline absoluto com Event.wait
+        # (em ambos o tempo de coleta não se soma ao intervalo)
+        if HAS_TIMERFD:
+            try:
+                self._timer = TimerFd(INTERVALO)
+            except OSError as e:
+                print(f"[Sender] timerfd indisponível: {e}")
+        next_t = time.monotonic()
+        
+        send_thread = threading.Thread(target=self._send_worker, daemon=True)
+        send_thread.start()
+        
+        # Referências locais (LOAD_FAST no laço em vez de global + atributo)
+        coletar = self._coletar
+        put = self._queue.put
+        timer_wait = self._timer.wait if self._timer is not None else None
+        shutdown = self._shutdown
+        monotonic = time.monotonic
+        
         while self.running:
             if not self.paused:
                 try:
-                    # Coleta dados
-                    hw_data = None
-                    if self.monitor and self.monitor.enabled:
-                        hw_data = self.monitor.fetch_data()
-                    
-                    # Monta payload
-                    payload = self._build_payload(hw_data)
-                    
-                    # Serializa e compacta
-                    data = json.dumps(payload).encode()
-                    compressed = gzip.compress(data)
-                    
-                    # Magic byte: 0x01 = gzip, 0x00 = raw JSON
-                    # Envia com prefixo indicando tipo de encoding
-                    if len(compressed) < len(data):
-                        sent = self.sock.sendto(b'\x01' + compressed, (DEST_IP, PORTA))
-                        print(f"[Send] {sent} bytes para {DEST_IP}:{PORTA} (gzip)")
-                    else:
-                        sent = self.sock.sendto(b'\x00' + data, (DEST_IP, PORTA))
-                        print(f"[Send] {sent} bytes para {DEST_IP}:{PORTA} (raw)")
-                    
+                    # Coleta dados (serialização e envio ficam com a thread de envio)
+                    # self.monitor lido a cada ciclo: _restart_monitor troca a instância
+                    monitor = self.monitor
+                    put(coletar(monitor.fetch_data() if monitor and monitor.enabled else None))
                 except Exception as e:
                     print(f"[Erro] {e}")
             
-            time.sleep(INTERVALO)
+            if timer_wait is not None:
+                # Disparos perdidos (ciclo lento) são agregados num único read
+                timer_wait()
+                if shutdown.is_set():
+                    break
+                continue
+            
+            next_t += INTERVALO
+            dt = next_t - monotonic()
+            if dt > 0:
+                # Acorda na hora se _quit for chamado durante a espera
+                if shutdown.wait(dt):
+                    break
+            elif dt < -INTERVALO:
+                # Travou mais de um ciclo (ex: sensor lento): ressincroniza
+                next_t = monotonic()
         
-        # Cleanup
+        # Cleanup (a thread de envio termina antes do socket fechar)
+        self._queue.put(None)
+        send_thread.join(timeout=2)
+        if self._timer is not None:
+            self._timer.close()
         if self.monitor:
             self.monitor.close()
         self.sock.close()
     
+    def _send_worker(self):
+        """Thread de envio: monta, serializa e envia as amostras da fila."""
+        # Referências locais (LOAD_FAST no laço em vez de global + atributo)
+        get, get_nowait, empty = self._queue.get, self._queue.get_nowait, self._queue.empty
+        build_payload = self._build_payload
+        enviar = self._enfileirar_lote if self._lote_s > 0 and not self._binary else None
+        send_payload, registrar_envio = self._send_payload, self._registrar_envio
+        diff = self._diff if self._delta_every > 0 and not self._binary else None
+        
+        running = True
+        while running:
+            samples = [get()]
+            # Fila atrasada (envio lento): esvazia de uma vez
+            while not empty():
+                samples.append(get_nowait())
+            if None in samples:
+                # Encerramento: envia o que chegou antes do sinal e sai
+                samples = samples[:samples.index(None)]
+                running = False
+            if not samples:
+                continue
+            
+            if len(samples) > 1:
+                # Todas são enviadas em ordem; o atraso entra no resumo periódico
+                self._backlog += len(samples) - 1
+                log.debug("[Send] Fila atrasada: %d amostra(s) pendente(s)", len(samples) - 1)
+            
+            for sample in samples:
+                try:
+                    payload = build_payload(sample)
+                    delta, snap = diff(payload) if diff is not None else (None, None)
+                    if enviar is not None:
+                        # Com lote, as amostras atrasadas entram no mesmo lote
+                        enviar(payload, delta, snap)
+                    else:
+                        registrar_envio(*send_payload(payload, delta, snap))
+                except Exception as e:
+                    print(f"[Erro] {e}")
+    
+    def _send_payload(self, payload: dict[str, Any],
+                      delta: Optional[dict[str, Any]] = None,
+                      snap: Optional[int] = None) -> tuple[int, str]:
+        """
+        Serializa (com magic byte) e envia um payload. Retorna (bytes, encoding).
+        
+        Com delta, envia só a atualização diferencial no lugar do payload completo;
+        com snap, o payload completo leva o id do snapshot (ver _diff).
+        """
+        if delta is not None:
+            packet, encoding = self._encode_json(_dumps(delta))
+            return self._send(packet), encoding
+        
+        packet, encoding = self._encode(payload, snap)
+        if len(packet) > MAX_DATAGRAM and payload["storage"] and not self._binary:
+            # Acima do MTU: storage vai em pacotes separados (sem fragmentação IP)
+            parts = self._split_storage(payload, snap)
+            return sum(self._send(part) for part, _ in parts), encoding
+        return self._send(packet), encoding
+    
+    def _enfileirar_lote(self, payload: dict[str, Any], delta: Optional[dict[str, Any]] = None,
+                         snap: Optional[int] = None):
+        """
+        Acumula amostras e envia um único {"samples": [...]} a cada lote_ms
+        (ou antes, se o lote passar de BATCH_FLUSH_BYTES).
+        """
+        data = _dumps(delta) if delta is not None else _dumps_payload(payload, snap)
+        if self._pending and self._pending_size + len(data) > BATCH_FLUSH_BYTES:
+            self._flush_lote()
+        if len(data) > BATCH_FLUSH_BYTES:
+            # Amostra grande demais para lote: vai sozinha (com divisão de storage)
+            self._registrar_envio(*self._send_payload(payload, delta, snap))
+            return
+        
+        self._pending.append(data)
+        self._pending_size += len(data) + 1
+        if time.monotonic() - self._last_flush >= self._lote_s:
+            self._flush_lote()
+    
+    def _flush_lote(self):
+        """Envia as amostras acumuladas num único datagrama."""
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return
+        batch = b'{"samples":[' + b",".join(self._pending) + b"]}"
+        self._pending.clear()
+        self._pending_size = 0
+        packet, encoding = self._encode_json(batch)
+        self._registrar_envio(self._send(packet), encoding)
+    
+    def _diff(self, payload: dict[str, Any]) -> tuple[Optional[dict[str, Any]], Optional[int]]:
+        """
+        Atualização diferencial em relação ao último snapshot completo.
+        
+        Retorna (delta, snap). A cada delta_a_cada envios retorna (None, id):
+        enviar o payload completo com o id em "snap" (vira a nova base). Nos
+        demais, retorna ({"type": "delta", "base": id, "d": {...}}, None) só com
+        os valores que mudaram desde essa base. Perder um delta não afeta os seguintes; se o snapshot
+        se perder, o receiver descarta os deltas dele (o id não confere) e fica
+        com os valores antigos até o próximo snapshot.
+        """
+        if self._delta_count % self._delta_every == 0:
+            self._snap_id = (self._snap_id + 1) & 0xFFFF
+            # Cópia rasa por seção: o payload é mutado in-place a cada ciclo
+            self._delta_base = {section: values.copy() for section, values in payload.items()}
+            self._delta_count = 1
+            return None, self._snap_id
+        self._delta_count += 1
+        
+        changed: dict[str, Any] = {}
+        for section, values in payload.items():
+            base = self._delta_base[section]
+            if isinstance(values, dict):
+                diff = {key: value for key, value in values.items() if base.get(key) != value}
+                if diff:
+                    changed[section] = diff
+            elif values != base:
+                changed[section] = values
+        return {"type": "delta", "base": self._snap_id, "d": changed}, None
+    
+    def _registrar_envio(self, sent: int, encoding: str):
+        """Atualiza contadores e imprime o resumo a cada SUMMARY_EVERY envios."""
+        log.debug("[Send] %d bytes para %s:%d (%s)", sent, DEST_IP, PORTA, encoding)
+        self._msg_count += 1
+        self._byte_count += sent
+        if self._msg_count % SUMMARY_EVERY == 0:
+            backlog = f", {self._backlog} amostras atrasadas" if self._backlog else ""
+            print(f"[Send] {self._msg_count} pacotes enviados "
+                  f"({self._byte_count // self._msg_count} bytes/pacote, {encoding}{backlog})")
+    
     def run(self):
         """Inicia o sender."""
         # Inicia thread de envio
         sender_thread = threading.Thread(target=self._sender_loop, daemon=True)
         sender_thread.start()
         
+        # Ping em paralelo (connect lento não atrasa o envio)
+        threading.Thread(target=self._ping_worker, daemon=True).start()
+        
         if HAS_TRAY:
+            # Menus pré-montados: alternar pausa só troca a referência
+            self._menu_active = self._build_menu(paused=False)
+            self._menu_paused = self._build_menu(paused=True)
+            
             # Minimiza console
             try:
                 hwnd = ctypes.windll.kernel32.GetConsoleWindow()
@@ -407,9 +1007,11 @@ class TelemetrySender:
         else:
             # Sem tray, roda no console
             print("[Console] Ctrl+C para sair...")
+            # Windows: Event.wait() sem timeout não é interrompido por Ctrl+C
+            timeout = 1.0 if sys.platform == 'win32' else None
             try:
-                while self.running:
-                    time.sleep(1)
+                while not self._shutdown.wait(timeout):
+                    pass
             except KeyboardInterrupt:
                 self._quit()
 
@@ -0,0 +1,18 @@
+"""
+Utilitários de socket compartilhados pelos scripts de teste de rede.
+"""
+import socket
+
+# Buffer dos sockets UDP: o padrão do SO (~208 KB no Linux) descarta pacotes em rajadas
+SOCKET_BUFFER = 4 * 1024 * 1024
+
+
+def tune_buffer(sock, option, size=SOCKET_BUFFER):
+    """Aumenta SO_RCVBUF/SO_SNDBUF e avisa se o kernel limitou o valor."""
+    sock.setsockopt(socket.SOL_SOCKET, option, size)
+    effective = sock.getsockopt(socket.SOL_SOCKET, option)
+    if effective < size:
+        sysctl = 'rmem_max' if option == socket.SO_RCVBUF else 'wmem_max'
+        print(f"  ⚠ Buffer limitado pelo kernel a {effective} bytes "
+              f"(Linux: sudo sysctl -w net.core.{sysctl}={size})")
+    return effective
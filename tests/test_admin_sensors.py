@@ -193,15 +193,26 @@ def test_full_sender_payload():
             }
         }
         
-        # Serializar e comprimir
-        json_data = json.dumps(payload).encode('utf-8')
-        compressed = gzip.compress(json_data)
+        # Serializar (orjson se instalado) e comprimir (nível 1: velocidade acima de tamanho)
+        try:
+            import orjson
+            json_data = orjson.dumps(payload)
+        except ImportError:
+            json_data = json.dumps(payload).encode('utf-8')
+        compressed = gzip.compress(json_data, compresslevel=1)
         
         print(f"\n✓ Payload criado com sucesso")
         print(f"  Tamanho JSON: {len(json_data)} bytes")
-        print(f"  Tamanho comprimido: {len(compressed)} bytes")
+        print(f"  Tamanho comprimido (gzip 1): {len(compressed)} bytes")
         print(f"  Taxa de compressão: {(1 - len(compressed)/len(json_data))*100:.1f}%")
         
+        try:
+            import zstandard
+            compressed_zstd = zstandard.ZstdCompressor(level=1).compress(json_data)
+            print(f"  Tamanho comprimido (zstd 1): {len(compressed_zstd)} bytes")
+        except ImportError:
+            print("  (zstandard não instalado - sem comparação com zstd)")
+        
         print("\n--- RESUMO DO PAYLOAD ---")
         print(f"  CPU: usage={payload['cpu']['usage']}%, temp={payload['cpu']['temp']}°C, power={payload['cpu']['power']}W")
         print(f"  GPU: load={payload['gpu']['load']}%, temp={payload['gpu']['temp']}°C, fan={payload['gpu']['fan']}RPM")
@@ -7,6 +7,8 @@ import gzip
 import time
 import threading
 
+from net_utils import tune_buffer
+
 PORTA = 5005
 
 def test_sender():
@@ -14,11 +16,11 @@ def test_sender():
     print("[Sender] Iniciando teste...")
     sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
     sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+    tune_buffer(sock, socket.SO_SNDBUF)
     
-    payload = {"test": True, "timestamp": time.time()}
-    data = json.dumps(payload).encode()
-    
+    # 5 pacotes numerados, um a cada 0.5s
     for i in range(5):
+        data = json.dumps({"test": True, "seq": i + 1, "timestamp": time.time()}).encode()
         sock.sendto(data, ("255.255.255.255", PORTA))
         print(f"[Sender] Enviado pacote {i+1}/5")
         time.sleep(0.5)
@@ -31,6 +33,7 @@ def test_receiver():
     print("[Receiver] Iniciando teste...")
     sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
     sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    tune_buffer(sock, socket.SO_RCVBUF)
     sock.bind(("0.0.0.0", PORTA))
     sock.settimeout(5.0)
     
@@ -49,7 +52,7 @@ def test_receiver():
             except:
                 pass
             
-            payload = json.loads(data.decode())
+            payload = json.loads(data)
             print(f"[Receiver] Recebido de {addr}: {payload}")
             received += 1
             
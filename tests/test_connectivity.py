@@ -5,6 +5,8 @@ Execute no NOTEBOOK para verificar se consegue receber do PC.
 import socket
 import time
 
+from net_utils import tune_buffer
+
 def test_connection():
     print("="*50)
     print("TESTE DE CONECTIVIDADE - RECEIVER")
@@ -22,6 +24,7 @@ def test_connection():
     # Criar socket
     sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
     sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    tune_buffer(sock, socket.SO_RCVBUF)
     sock.bind(('', porta))
     sock.settimeout(2)
     
@@ -0,0 +1,64 @@
+"""
+Teste do modo delta: saída serializada pelo sender passando pelo DeltaMerger
+Roda com pytest ou direto: python tests/test_delta.py (requer psutil)
+"""
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.argv.append("--no-admin")  # importar o sender não deve pedir elevação
+
+import sender_pc
+from core.protocol import DeltaMerger
+
+
+def make_sender(delta_every):
+    """Sender só com o estado usado por _diff (sem socket nem monitor)."""
+    sender = sender_pc.TelemetrySender.__new__(sender_pc.TelemetrySender)
+    sender._delta_every = delta_every
+    sender._delta_count = 0
+    sender._delta_base = {}
+    sender._snap_id = 0
+    return sender
+
+
+def wire(sender, payload):
+    """JSON como o sender enviaria (snapshot pelo template, delta por _dumps)."""
+    delta, snap = sender._diff(payload)
+    data = sender_pc._dumps(delta) if delta is not None else sender_pc._dumps_payload(payload, snap)
+    return json.loads(data)
+
+
+def test_deltas_merge_onto_snapshot():
+    sender, merger = make_sender(4), DeltaMerger()
+    payload = sender_pc.TelemetrySender._novo_payload()
+    for i in range(10):
+        payload["cpu"]["usage"] = 10.0 + i
+        payload["ram"]["percent"] = 50.0 + (i // 3)
+        merged = merger.feed(wire(sender, payload))
+        assert merged is not None, f"ciclo {i}: delta descartado"
+        assert merged["cpu"]["usage"] == payload["cpu"]["usage"]
+        assert merged["ram"]["percent"] == payload["ram"]["percent"]
+    assert "snap" not in payload
+
+
+def test_deltas_of_lost_snapshot_are_dropped():
+    sender, merger = make_sender(3), DeltaMerger()
+    payload = sender_pc.TelemetrySender._novo_payload()
+    results = []
+    for i in range(6):
+        payload["cpu"]["usage"] = float(i)
+        packet = wire(sender, payload)
+        if i == 3:
+            continue  # segundo snapshot perdido
+        results.append(merger.feed(packet))
+    # ciclos 0-2 aplicados; 4 e 5 são deltas do snapshot perdido
+    assert [r["cpu"]["usage"] for r in results[:3]] == [0.0, 1.0, 2.0]
+    assert results[3:] == [None, None]
+
+
+if __name__ == "__main__":
+    test_deltas_merge_onto_snapshot()
+    test_deltas_of_lost_snapshot_are_dropped()
+    print("✓ Modo delta OK")
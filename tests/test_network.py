@@ -10,44 +10,107 @@ Este script:
 import socket
 import json
 import gzip
+import zlib
 import time
-import threading
+import asyncio
+import functools
+from collections import deque
 import os
 import sys
 import ctypes
 
+# Adicionar diretório pai ao path para imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import psutil
+import hardware_monitor
+
+from net_utils import tune_buffer
+
+# orjson serializa direto para bytes (opcional: pip install orjson)
+try:
+    import orjson
+    json_dumps = orjson.dumps
+    json_loads = orjson.loads
+except ImportError:
+    def json_dumps(obj):
+        return json.dumps(obj).encode('utf-8')
+    json_loads = json.loads
+
+# zstd nível 1 comprime mais rápido que gzip (opcional: pip install zstandard)
+try:
+    import zstandard
+    ZSTD_COMPRESSOR = zstandard.ZstdCompressor(level=1)  # criar o contexto é caro
+    ZSTD_DECOMPRESSOR = zstandard.ZstdDecompressor()
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+# Lote de amostras por datagrama: {"samples": [...]} (mesmo formato do sender com lote_ms)
+BATCH_N = 4           # amostras por pacote
+BATCH_TIMEOUT = 2.0   # segundos máximos segurando um lote incompleto
+COMPRESS_MIN = 512    # bytes de JSON abaixo dos quais o pacote vai sem compressão
+
+def encode_batch_into(buf, batch):
+    """Junta amostras já serializadas em {"samples": [...]}, comprime e escreve em buf
+    (magic byte + dados). Retorna o tamanho do pacote."""
+    json_data = b'{"samples":[' + b','.join(batch) + b']}'
+    if len(json_data) < COMPRESS_MIN:
+        buf[0] = 0x00
+        compressed = json_data
+    elif HAS_ZSTD:
+        buf[0] = 0x05
+        compressed = ZSTD_COMPRESSOR.compress(json_data)
+    else:
+        buf[0] = 0x01
+        # wbits=31: membro gzip completo numa chamada de zlib (sem montar cabeçalho/CRC em Python)
+        compressed = zlib.compress(json_data, 1, wbits=31)
+    end = 1 + len(compressed)
+    buf[1:end] = compressed
+    return end
+
 def is_admin():
     try:
         return ctypes.windll.shell32.IsUserAnAdmin()
     except:
         return False
 
+@functools.lru_cache(maxsize=1)
+def local_addresses():
+    """Hostname, IPv4 locais e IP principal (não mudam durante o teste: resolvidos uma vez)."""
+    hostname = socket.gethostname()
+    
+    # Método 1: getaddrinfo do hostname (só IPv4)
+    try:
+        infos = socket.getaddrinfo(hostname, None, family=socket.AF_INET)
+        ips = list(dict.fromkeys(info[4][0] for info in infos))
+    except OSError:
+        ips = []
+    local_ip = next((ip for ip in ips if not ip.startswith("127.")), None)
+    
+    # Método 2 (só se o hostname não resolver para a LAN): conectar a um IP externo
+    if local_ip is None:
+        try:
+            s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            s.connect(("8.8.8.8", 80))
+            local_ip = s.getsockname()[0]
+            s.close()
+        except OSError:
+            local_ip = "127.0.0.1"
+    
+    return hostname, tuple(ips), local_ip
+
 def get_network_info():
     """Obtém informações de rede do computador."""
     print("\n" + "="*60)
     print("INFORMAÇÕES DE REDE")
     print("="*60)
     
-    hostname = socket.gethostname()
+    hostname, ips, local_ip = local_addresses()
     print(f"  Hostname: {hostname}")
-    
-    # Obter todos os IPs locais
-    try:
-        # Método 1: gethostbyname_ex
-        _, _, ips = socket.gethostbyname_ex(hostname)
+    if ips:
         print(f"  IPs locais: {', '.join(ips)}")
-    except:
-        pass
-    
-    # Método 2: conectar a um IP externo para descobrir o IP local
-    try:
-        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        s.connect(("8.8.8.8", 80))
-        local_ip = s.getsockname()[0]
-        s.close()
-        print(f"  IP principal: {local_ip}")
-    except:
-        local_ip = "127.0.0.1"
+    print(f"  IP principal: {local_ip}")
     
     # Carregar config
     config_path = os.path.join(os.path.dirname(__file__), 'config.json')
@@ -62,47 +125,50 @@ def get_network_info():
     
     return local_ip
 
-def receiver_thread(duration=10):
-    """Thread que recebe pacotes UDP."""
-    received_packets = []
-    
+def open_receiver():
+    """Socket UDP de recepção, não bloqueante (entregue ao event loop)."""
     sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
     sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    tune_buffer(sock, socket.SO_RCVBUF)
     sock.bind(('', 5005))
-    sock.settimeout(1)
+    sock.setblocking(False)
+    return sock
+
+class RecvProto(asyncio.DatagramProtocol):
+    """Recepção no event loop; guarda os bytes crus (decodificados só no relatório)."""
     
-    start_time = time.time()
+    def __init__(self, received_packets, start_time):
+        self.received_packets = received_packets
+        self.start_time = start_time
     
-    while time.time() - start_time < duration:
-        try:
-            data, addr = sock.recvfrom(65535)
-            
-            # Tentar descomprimir
-            try:
-                decompressed = gzip.decompress(data)
-                payload = json.loads(decompressed.decode('utf-8'))
-            except:
-                payload = json.loads(data.decode('utf-8'))
-            
-            received_packets.append({
-                "time": time.time() - start_time,
-                "addr": addr,
-                "payload": payload
-            })
-            
-        except socket.timeout:
-            continue
-        except Exception as e:
-            print(f"  Erro ao receber: {e}")
+    def datagram_received(self, data, addr):
+        self.received_packets.append((time.time() - self.start_time, addr, data))
     
-    sock.close()
-    return received_packets
+    def error_received(self, exc):
+        print(f"  Erro ao receber: {exc}")
 
-def sender_thread(duration=10):
-    """Thread que envia pacotes UDP (simulando o sender)."""
-    import hardware_monitor
-    import psutil
+def decode_samples(data):
+    """Decodifica um datagrama e retorna a lista de amostras (lote ou amostra única)."""
+    # Magic byte: 0x05 = zstd, 0x01 = gzip, 0x00 = raw JSON
+    magic = data[0] if data else None
+    if magic == 0x05 and HAS_ZSTD:
+        payload = json_loads(ZSTD_DECOMPRESSOR.decompress(data[1:]))
+    elif magic == 0x01:
+        payload = json_loads(gzip.decompress(data[1:]))
+    elif magic == 0x00:
+        payload = json_loads(data[1:])
+    else:
+        # Retrocompatibilidade: sem magic byte
+        try:
+            decompressed = gzip.decompress(data)
+            payload = json_loads(decompressed)
+        except:
+            payload = json_loads(data)
     
+    return payload["samples"] if "samples" in payload else [payload]
+
+async def sender_loop(start_time, duration=10):
+    """Envia pacotes UDP (simulando o sender); as esperas liberam o event loop para a recepção."""
     # Carregar config
     config_path = os.path.join(os.path.dirname(__file__), 'config.json')
     with open(config_path, 'r') as f:
@@ -114,61 +180,111 @@ def sender_thread(duration=10):
     
     sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
     sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
-    
-    # Inicializar monitor
-    monitor = hardware_monitor.HardwareMonitor()
+    tune_buffer(sock, socket.SO_SNDBUF)
+
+    # Linux: pacotes pequenos, sem descoberta de PMTU por envio
+    # (IP_MTU_DISCOVER = 10, IP_PMTUDISC_DONT = 0)
+    if sys.platform.startswith("linux"):
+        try:
+            sock.setsockopt(socket.IPPROTO_IP, getattr(socket, "IP_MTU_DISCOVER", 10),
+                            getattr(socket, "IP_PMTUDISC_DONT", 0))
+        except OSError:
+            pass
+
+    # Inicializar monitor (construtor e leituras bloqueiam: rodam fora do loop,
+    # senão o receiver que divide o loop fica parado e a latência medida distorce)
+    monitor = await asyncio.to_thread(hardware_monitor.HardwareMonitor)
     
     sent_count = 0
-    start_time = time.time()
+    batch = []
+    batch_start = start_time
+    
+    # Estrutura do payload montada uma vez; o laço só atualiza os valores
+    # (cada amostra é serializada na hora, então reaproveitar o dict é seguro)
+    payload = {
+        "cpu": {"usage": 0, "temp": 0, "voltage": 0, "power": 0, "clock": 0},
+        "gpu": {
+            "load": 0,
+            "temp": 0,
+            "voltage": 0,
+            "clock_core": 0,
+            "clock_mem": 0,
+            "fan": 0,
+            "mem_used_mb": 0
+        },
+        "mobo": {"temp": 0},
+        "ram": {"percent": 0, "used_gb": 0, "total_gb": 0},
+        "storage": [],
+        "fans": [],
+        "network": {"down_kbps": 0, "up_kbps": 0, "ping_ms": 0}
+    }
+    cpu, gpu, ram = payload["cpu"], payload["gpu"], payload["ram"]
+    # RAM total não muda durante o teste: lida uma vez
+    ram["total_gb"] = round(psutil.virtual_memory().total / (1024**3), 2)
+    
+    # Lookups fora do laço (LOAD_GLOBAL/LOAD_ATTR uma vez só)
+    _now = time.time
+    _sleep = asyncio.sleep
+    _dumps = json_dumps
+    _encode = encode_batch_into
+    _sendto = sock.sendto
+    
+    # Buffer de envio reaproveitado (sem concatenar magic byte + dados a cada pacote)
+    send_buf = bytearray(65536)
+    send_view = memoryview(send_buf)
+    _cpu = psutil.cpu_percent
+    _mem = psutil.virtual_memory
+    _fetch = monitor.fetch_data if monitor.enabled else None
+    _to_thread = asyncio.to_thread
+    dest = (dest_ip, porta)
     
-    while time.time() - start_time < duration:
+    while _now() - start_time < duration:
         try:
             # Coletar dados
-            hw_data = monitor.fetch_data() if monitor.enabled else None
-            mem = psutil.virtual_memory()
+            hw_data = await _to_thread(_fetch) if _fetch else None
+            mem = _mem()
             
-            payload = {
-                "cpu": {
-                    "usage": psutil.cpu_percent(),
-                    "temp": hw_data["cpu"]["temp"] if hw_data else 0,
-                    "voltage": hw_data["cpu"]["voltage"] if hw_data else 0,
-                    "power": hw_data["cpu"]["power"] if hw_data else 0,
-                    "clock": hw_data["cpu"]["clock"] if hw_data else 0
-                },
-                "gpu": {
-                    "load": hw_data["gpu"]["load"] if hw_data else 0,
-                    "temp": hw_data["gpu"]["temp"] if hw_data else 0,
-                    "voltage": hw_data["gpu"]["voltage"] if hw_data else 0,
-                    "clock_core": hw_data["gpu"]["clock_core"] if hw_data else 0,
-                    "clock_mem": hw_data["gpu"]["clock_mem"] if hw_data else 0,
-                    "fan": hw_data["gpu"]["fan"] if hw_data else 0,
-                    "mem_used_mb": hw_data["gpu"]["mem_used"] if hw_data else 0
-                },
-                "mobo": {
-                    "temp": hw_data["mobo"]["temp"] if hw_data else 0
-                },
-                "ram": {
-                    "percent": mem.percent,
-                    "used_gb": round(mem.used / (1024**3), 2),
-                    "total_gb": round(mem.total / (1024**3), 2)
-                },
-                "storage": hw_data["storage"] if hw_data else [],
-                "fans": hw_data["fans"] if hw_data else [],
-                "network": {
-                    "down_kbps": 0,
-                    "up_kbps": 0,
-                    "ping_ms": 0
-                }
-            }
+            cpu["usage"] = _cpu()
+            ram["percent"] = mem.percent
+            ram["used_gb"] = round(mem.used / (1024**3), 2)
             
-            # Comprimir e enviar
-            json_data = json.dumps(payload).encode('utf-8')
-            compressed = gzip.compress(json_data)
-            sock.sendto(compressed, (dest_ip, porta))
-            sent_count += 1
+            # Sem monitor os sensores ficam zerados (valores iniciais do template)
+            if hw_data:
+                hw_cpu, hw_gpu = hw_data["cpu"], hw_data["gpu"]
+                cpu["temp"] = hw_cpu["temp"]
+                cpu["voltage"] = hw_cpu["voltage"]
+                cpu["power"] = hw_cpu["power"]
+                cpu["clock"] = hw_cpu["clock"]
+                gpu["load"] = hw_gpu["load"]
+                gpu["temp"] = hw_gpu["temp"]
+                gpu["voltage"] = hw_gpu["voltage"]
+                gpu["clock_core"] = hw_gpu["clock_core"]
+                gpu["clock_mem"] = hw_gpu["clock_mem"]
+                gpu["fan"] = hw_gpu["fan"]
+                gpu["mem_used_mb"] = hw_gpu["mem_used"]
+                payload["mobo"]["temp"] = hw_data["mobo"]["temp"]
+                payload["storage"] = hw_data["storage"]
+                payload["fans"] = hw_data["fans"]
             
-            time.sleep(intervalo)
+            # Acumula no lote; serializa, comprime e envia uma vez por lote
+            if not batch:
+                batch_start = _now()
+            batch.append(_dumps(payload))
+            if len(batch) >= BATCH_N or _now() - batch_start >= BATCH_TIMEOUT:
+                _sendto(send_view[:_encode(send_buf, batch)], dest)
+                sent_count += len(batch)
+                batch = []
             
+            await _sleep(intervalo)
+            
+        except Exception as e:
+            print(f"  Erro ao enviar: {e}")
+    
+    # Último lote incompleto
+    if batch:
+        try:
+            _sendto(send_view[:_encode(send_buf, batch)], dest)
+            sent_count += len(batch)
         except Exception as e:
             print(f"  Erro ao enviar: {e}")
     
@@ -177,6 +293,31 @@ def sender_thread(duration=10):
         monitor.close()
     return sent_count
 
+async def countdown(duration):
+    """Mostra o tempo restante do teste."""
+    for i in range(duration, 0, -1):
+        print(f"  Testando... {i}s restantes", end='\r')
+        await asyncio.sleep(1)
+
+async def run_test(duration=10):
+    """Envio, recepção e contagem regressiva numa única thread (asyncio)."""
+    loop = asyncio.get_running_loop()
+    # Janela limitada: (tempo, endereço, bytes) sem parse na recepção
+    received_packets = deque(maxlen=10000)
+    start_time = time.time()
+    
+    # Socket de recepção aberto antes do primeiro envio
+    transport, _ = await loop.create_datagram_endpoint(
+        lambda: RecvProto(received_packets, start_time), sock=open_receiver())
+    timer = asyncio.create_task(countdown(duration))
+    try:
+        sent = await sender_loop(start_time, duration)
+        await asyncio.sleep(0.5)  # Pacotes que chegaram depois do último envio
+    finally:
+        timer.cancel()
+        transport.close()
+    return sent, received_packets
+
 def main():
     print("="*60)
     print("TESTE DE COMUNICAÇÃO PONTA A PONTA")
@@ -197,24 +338,15 @@ def main():
     print("\nEnviando e recebendo pacotes simultaneamente...")
     print("(No cenário real, o receiver estará em outro dispositivo)")
     
-    # Iniciar threads
-    recv_thread = threading.Thread(target=lambda: setattr(recv_thread, 'result', receiver_thread(10)))
-    send_thread = threading.Thread(target=lambda: setattr(send_thread, 'result', sender_thread(10)))
+    sent, datagrams = asyncio.run(run_test(10))
     
-    recv_thread.start()
-    time.sleep(0.5)  # Dar tempo pro receiver iniciar
-    send_thread.start()
-    
-    # Aguardar
-    for i in range(10, 0, -1):
-        print(f"  Testando... {i}s restantes", end='\r')
-        time.sleep(1)
-    
-    send_thread.join()
-    recv_thread.join()
-    
-    sent = getattr(send_thread, 'result', 0)
-    received = getattr(recv_thread, 'result', [])
+    # Decodifica fora do laço: cada amostra de um lote conta como um pacote recebido
+    received = []
+    for t, addr, data in datagrams:
+        try:
+            received.extend((t, addr, sample) for sample in decode_samples(data))
+        except Exception as e:
+            print(f"  Erro ao decodificar pacote de {addr[0]}: {e}")
     
     print("\n\n" + "="*60)
     print("RESULTADOS DO TESTE")
@@ -226,26 +358,26 @@ def main():
     if len(received) > 0:
         print(f"\n✓ COMUNICAÇÃO UDP FUNCIONANDO!")
         print(f"\n  Último pacote recebido:")
-        last = received[-1]
-        print(f"    De: {last['addr']}")
-        print(f"    Tempo: {last['time']:.2f}s após início")
+        last_time, last_addr, payload = received[-1]
+        print(f"    De: {last_addr}")
+        print(f"    Tempo: {last_time:.2f}s após início")
         
         # Analisar payload
-        payload = last['payload']
         print(f"\n  --- Dados do Payload ---")
         
+        # Uma passada: relatório por categoria e totais (storage/fans são listas)
+        total_sensors = non_zero_sensors = 0
         for category, sensors in payload.items():
-            non_zero = sum(1 for v in sensors.values() if v != 0)
+            if not isinstance(sensors, dict):
+                print(f"    {category.upper()}: {len(sensors)} item(s)")
+                continue
+            non_zero = sum(map(bool, sensors.values()))  # PyObject_IsTrue em C, sem gerador
             total = len(sensors)
+            total_sensors += total
+            non_zero_sensors += non_zero
             print(f"    {category.upper()}: {non_zero}/{total} sensores com valores")
         
         # Verificar se sensores estão funcionando
-        total_sensors = sum(len(s) for s in payload.values())
-        non_zero_sensors = sum(
-            sum(1 for v in s.values() if v != 0) 
-            for s in payload.values()
-        )
-        
         print(f"\n  Total: {non_zero_sensors}/{total_sensors} sensores funcionando")
         
         if non_zero_sensors < total_sensors * 0.5:
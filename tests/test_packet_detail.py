@@ -5,6 +5,15 @@ import socket
 import json
 import gzip
 
+try:
+    import zstandard
+    ZSTD_DECOMPRESSOR = zstandard.ZstdDecompressor()
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+from net_utils import tune_buffer
+
 print('='*60)
 print('VISUALIZADOR DE PACOTE DETALHADO')
 print('='*60)
@@ -12,22 +21,45 @@ print('Aguardando 1 pacote...')
 
 sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
 sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+tune_buffer(sock, socket.SO_RCVBUF)
 sock.bind(('', 5005))
 sock.settimeout(5)
 
 try:
     data, addr = sock.recvfrom(65535)
     
-    # Descomprimir
-    try:
-        decompressed = gzip.decompress(data)
-        payload = json.loads(decompressed.decode('utf-8'))
-        print(f'\n✓ Pacote recebido de {addr[0]}:{addr[1]}')
+    # Descomprimir (magic byte: 0x05 = zstd, 0x01 = gzip, 0x00 = raw JSON)
+    magic = data[0] if data else None
+    if magic == 0x05 and not HAS_ZSTD:
+        raise SystemExit('\n✗ Pacote zstd recebido, mas zstandard não está instalado (pip install zstandard)')
+    if magic in (0x05, 0x01):
+        if magic == 0x05:
+            decompressed = ZSTD_DECOMPRESSOR.decompress(data[1:])
+        else:
+            decompressed = gzip.decompress(data[1:])
+        payload = json.loads(decompressed)
+        print(f'\n✓ Pacote recebido de {addr[0]}:{addr[1]} ({"zstd" if magic == 0x05 else "gzip"})')
         print(f'  Tamanho original: {len(decompressed)} bytes')
         print(f'  Tamanho comprimido: {len(data)} bytes')
-    except:
-        payload = json.loads(data.decode('utf-8'))
+    elif magic == 0x00:
+        payload = json.loads(data[1:])
         print(f'\n✓ Pacote recebido de {addr[0]} (sem compressão)')
+    else:
+        # Retrocompatibilidade: sem magic byte
+        try:
+            decompressed = gzip.decompress(data)
+            payload = json.loads(decompressed)
+            print(f'\n✓ Pacote recebido de {addr[0]}:{addr[1]}')
+            print(f'  Tamanho original: {len(decompressed)} bytes')
+            print(f'  Tamanho comprimido: {len(data)} bytes')
+        except:
+            payload = json.loads(data)
+            print(f'\n✓ Pacote recebido de {addr[0]} (sem compressão)')
+    
+    # Lote de amostras: detalha a mais recente
+    if 'samples' in payload:
+        print(f'  Lote com {len(payload["samples"])} amostras (mostrando a última)')
+        payload = payload['samples'][-1]
     
     print('\n' + '='*60)
     print('PAYLOAD COMPLETO:')
@@ -0,0 +1,53 @@
+"""
+Teste de ida e volta do formato binário (core.protocol)
+Roda com pytest ou direto: python tests/test_protocol.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.protocol import pack_binary, pack_binary_into, unpack_binary
+
+# Disco NVMe real: taxas em bytes/s bem acima de 21 MB/s e contadores na casa dos TB
+DISK = {
+    "name": "Samsung SSD 980 PRO 1TB",
+    "temp": 47.5,
+    "health": 98,
+    "used_space": 61.23,
+    "read_activity": 12.5,
+    "write_activity": 3.25,
+    "total_activity": 15.75,
+    "read_rate": 3_456_789_012.0,
+    "write_rate": 123_456_789.0,
+    "data_read_gb": 52345.67,
+    "data_written_gb": 41000.1,
+}
+
+PAYLOAD = {
+    "cpu": {"usage": 37.5, "temp": 62.0, "voltage": 1.215, "power": 88.4, "clock": 4650},
+    "gpu": {"load": 91.0, "temp": 71.0, "fan": 1850, "mem_used_mb": 7012},
+    "ram": {"percent": 54.2, "used_gb": 17.35, "total_gb": 31.9},
+    "network": {"down_kbps": 1520.4, "up_kbps": 88.1, "ping_ms": 12.0,
+                "link_speed_mbps": 1000, "adapter_name": "Ethernet"},
+    "storage": [DISK],
+    "fans": [{"name": "CPU Fan", "rpm": 1420}],
+}
+
+
+def test_storage_round_trip():
+    disk = unpack_binary(pack_binary(PAYLOAD))["storage"][0]
+    for key, value in DISK.items():
+        assert disk[key] == value, f"{key}: {disk[key]} != {value}"
+
+
+def test_pack_into_matches_pack():
+    buf = bytearray(1024)
+    end = pack_binary_into(buf, 0, PAYLOAD)
+    assert bytes(buf[:end]) == pack_binary(PAYLOAD)
+
+
+if __name__ == "__main__":
+    test_storage_round_trip()
+    test_pack_into_matches_pack()
+    print("✓ Formato binário OK")
@@ -6,6 +6,30 @@ import json
 import gzip
 import time
 
+try:
+    import zstandard
+    ZSTD_DECOMPRESSOR = zstandard.ZstdDecompressor()
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+from net_utils import tune_buffer
+
+# Decodificadores por magic byte (recebem o datagrama inteiro)
+DECODERS = {
+    0x00: lambda data: json.loads(data[1:]),                    # Raw JSON
+    0x01: lambda data: json.loads(gzip.decompress(data[1:])),   # GZIP
+}
+if HAS_ZSTD:
+    DECODERS[0x05] = lambda data: json.loads(ZSTD_DECOMPRESSOR.decompress(data[1:]))  # ZSTD
+
+def legacy_decode(data):
+    """Retrocompatibilidade: pacote sem magic byte (gzip ou JSON puro)."""
+    try:
+        return json.loads(gzip.decompress(data))
+    except:
+        return json.loads(data)
+
 print('='*60)
 print('RECEPTOR DE TESTE - CAPTURANDO PACOTES DO SENDER')
 print('='*60)
@@ -15,6 +39,7 @@ print()
 
 sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
 sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+tune_buffer(sock, socket.SO_RCVBUF)
 sock.bind(('', 5005))
 sock.settimeout(2)
 
@@ -26,19 +51,14 @@ try:
         try:
             data, addr = sock.recvfrom(65535)
             
-            # Magic byte: 0x01 = gzip, 0x00 = raw JSON
-            if len(data) > 0:
-                magic = data[0]
-                if magic == 0x01:  # GZIP
-                    payload = json.loads(gzip.decompress(data[1:]).decode('utf-8'))
-                elif magic == 0x00:  # Raw JSON
-                    payload = json.loads(data[1:].decode('utf-8'))
-                else:
-                    # Retrocompatibilidade
-                    try:
-                        payload = json.loads(gzip.decompress(data).decode('utf-8'))
-                    except:
-                        payload = json.loads(data.decode('utf-8'))
+            if not data:
+                continue
+            payload = DECODERS.get(data[0], legacy_decode)(data)
+            
+            # Lote de amostras: mostra a mais recente
+            if 'samples' in payload:
+                print(f'    (lote com {len(payload["samples"])} amostras)')
+                payload = payload['samples'][-1]
             
             count += 1
             cpu = payload.get('cpu', {})
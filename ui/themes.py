@@ -3,7 +3,9 @@ Definição de temas para a interface do Sistema de Telemetria
 Usa dataclass para type safety e fácil extensão
 """
 from dataclasses import dataclass, asdict
-from typing import Dict, Any
+from functools import lru_cache
+from types import SimpleNamespace
+from typing import Dict, Any, Union
 
 
 @dataclass(frozen=True)
@@ -35,11 +37,20 @@ class Theme:
     critical: str
     
     def to_dict(self) -> Dict[str, str]:
-        """Converte para dicionário (compatível com código legado)"""
-        result = asdict(self)
-        # Remove o nome para compatibilidade
-        del result['name']
-        return result
+        """
+        Converte para dicionário (compatível com código legado)
+        
+        O asdict() roda uma vez por tema (instância imutável); cada chamada
+        devolve uma cópia rasa, pois quem chama costuma alterar o dicionário.
+        """
+        cached = self.__dict__.get('_dict_cache')
+        if cached is None:
+            cached = asdict(self)
+            # Remove o nome para compatibilidade
+            del cached['name']
+            # frozen=True: grava o cache sem passar pelo __setattr__ da dataclass
+            object.__setattr__(self, '_dict_cache', cached)
+        return dict(cached)
     
     def get_color(self, key: str, default: str = "#ffffff") -> str:
         """Obtém uma cor pelo nome"""
@@ -131,6 +142,7 @@ THEMES: Dict[str, Theme] = {
 }
 
 
+@lru_cache(maxsize=16)
 def get_theme(name: str = "dark") -> Theme:
     """
     Obtém um tema pelo nome
@@ -144,6 +156,22 @@ def get_theme(name: str = "dark") -> Theme:
     return THEMES.get(name.lower(), DARK_THEME)
 
 
+def theme_colors(colors: Union[Theme, Dict[str, str]]) -> Any:
+    """
+    Cores com acesso por atributo (colors.panel) para os widgets
+    
+    Args:
+        colors: Theme ou dicionário de cores (formato legado)
+    
+    Returns:
+        O próprio Theme, ou um SimpleNamespace com as cores do dicionário
+        (chaves ausentes vêm do DARK_THEME)
+    """
+    if isinstance(colors, Theme):
+        return colors
+    return SimpleNamespace(**{**DARK_THEME.to_dict(), **colors})
+
+
 def get_theme_names() -> list[str]:
     """Retorna lista de nomes de temas disponíveis"""
     return list(THEMES.keys())
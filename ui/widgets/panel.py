@@ -2,9 +2,21 @@
 Widget de painel reutilizável para exibição de métricas
 """
 import tkinter as tk
-from typing import Dict, Any, Optional, Callable
+from tkinter import font as tkfont
+from typing import Dict, Any, Optional, Callable, Union
 from dataclasses import dataclass, field
 
+from ..themes import Theme, theme_colors
+
+
+# Formato de floats por unidade (demais unidades: 1 casa decimal)
+_FLOAT_FORMATS: Dict[str, str] = {
+    "V": "%.3fV",
+    "°C": "%.1f°C",
+    "%": "%.1f%%",
+    "W": "%.1fW",
+}
+
 
 @dataclass
 class PanelValue:
@@ -31,7 +43,7 @@ class TelemetryPanel:
         parent: tk.Widget,
         title: str,
         accent_color: str,
-        colors: Dict[str, str],
+        colors: Union[Theme, Dict[str, str]],
         font_section: tuple = ('Segoe UI', 11, 'bold'),
         font_small: tuple = ('Segoe UI', 9),
         font_value: tuple = ('Consolas', 11, 'bold'),
@@ -44,7 +56,7 @@ class TelemetryPanel:
             parent: Widget pai (Frame)
             title: Título do painel
             accent_color: Cor de destaque do painel
-            colors: Dicionário de cores do tema
+            colors: Tema (Theme ou dicionário de cores)
             font_section: Fonte do título
             font_small: Fonte dos labels
             font_value: Fonte dos valores
@@ -53,21 +65,30 @@ class TelemetryPanel:
         self.parent = parent
         self.title_text = title
         self.accent_color = accent_color
-        self.colors = colors
+        self._cache_colors(colors)
         self.font_section = font_section
         self.font_small = font_small
         self.font_value = font_value
         self.on_critical = on_critical
         
-        self.labels: Dict[str, Dict[str, tk.Widget]] = {}
+        self.labels: Dict[str, Dict[str, Any]] = {}
         
         self._create_widgets()
     
+    def _cache_colors(self, colors: Union[Theme, Dict[str, str]]) -> None:
+        """Guarda o tema e as cores mais usadas em atributos (sem lookup no dict a cada uso)"""
+        self.colors = colors = theme_colors(colors)
+        self._bg = colors.panel
+        self._fg_dim = colors.dim
+        self._fg_text = colors.text
+        self._fg_warn = colors.warning
+        self._fg_crit = colors.critical
+    
     def _create_widgets(self) -> None:
         """Cria os widgets do painel"""
         self.frame = tk.Frame(
             self.parent,
-            bg=self.colors["panel"],
+            bg=self._bg,
             highlightthickness=2,
             highlightbackground=self.accent_color
         )
@@ -78,12 +99,47 @@ class TelemetryPanel:
             text=f"── {self.title_text} ──",
             font=self.font_section,
             fg=self.accent_color,
-            bg=self.colors["panel"]
+            bg=self._bg
         )
         self.title_label.pack(pady=(5, 3))
         
-        self.values_frame = tk.Frame(self.frame, bg=self.colors["panel"])
+        self.values_frame = tk.Frame(self.frame, bg=self._bg)
         self.values_frame.pack(fill=tk.BOTH, expand=True, padx=8, pady=5)
+        
+        # Um único Text para todas as linhas ("Label:<tab>valor"); cores via tags.
+        # Tab alinhado à direita no fim da coluna de valores (10 + 12 caracteres)
+        tab_stop = (tkfont.Font(font=self.font_small).measure("0" * 10) +
+                    tkfont.Font(font=self.font_value).measure("0" * 12))
+        self.values_text = tk.Text(
+            self.values_frame,
+            font=self.font_value,
+            bg=self._bg,
+            fg=self._fg_text,
+            bd=0,
+            highlightthickness=0,
+            wrap="none",
+            width=22,
+            height=1,
+            spacing1=1,
+            spacing3=1,
+            cursor="arrow",
+            insertwidth=0,
+            takefocus=0,
+            tabs=(tab_stop, "right")
+        )
+        self.values_text.pack(fill=tk.BOTH, expand=True)
+        self.values_text.bind("<Key>", lambda e: "break")  # somente leitura
+        self.values_text.tag_configure("name", font=self.font_small)
+        self._configure_tags()
+        
+        self._order: list[str] = []  # chave de cada linha (linha N = índice N-1)
+    
+    def _configure_tags(self) -> None:
+        """Aplica as cores do tema às tags do texto"""
+        self.values_text.tag_configure("name", foreground=self._fg_dim)
+        self.values_text.tag_configure("text", foreground=self._fg_text)
+        self.values_text.tag_configure("warning", foreground=self._fg_warn)
+        self.values_text.tag_configure("critical", foreground=self._fg_crit)
     
     def update_value(
         self,
@@ -105,105 +161,125 @@ class TelemetryPanel:
             warn_threshold: Threshold para warning
             crit_threshold: Threshold para critical
         """
-        # Cria labels se não existirem
+        # Cria a linha se não existir (thresholds ficam registrados na linha)
         if key not in self.labels:
-            self._create_value_row(key, label)
+            self._create_value_row(key, label, warn_threshold, crit_threshold)
         
-        # Formata valor
-        text = self._format_value(value, unit)
+        row = self.labels[key]
+        if row["warn"] != warn_threshold or row["crit"] != crit_threshold:
+            self._set_thresholds(row, warn_threshold, crit_threshold)
         
-        # Atualiza texto
-        self.labels[key]["value"].config(text=text)
+        # Formata valor e determina cor (sem thresholds: sempre a cor de texto)
+        text = self._format_value(value, unit)
+        if row["_has_thresh"]:
+            tag = self._get_value_tag(value, warn_threshold, crit_threshold)
+        else:
+            tag = "text"
         
-        # Determina cor baseada em thresholds
-        color = self._get_value_color(value, warn_threshold, crit_threshold)
-        self.labels[key]["value"].config(fg=color)
+        # Só chama o Tk se texto ou cor mudaram
+        if row["_last"] != (text, tag):
+            self._write_value(key, text, tag)
         
-        # Callback para valores críticos
-        if (crit_threshold and 
-            isinstance(value, (int, float)) and 
-            value >= crit_threshold and 
-            self.on_critical):
+        # Callback para valores críticos (reusa a classificação feita para a cor)
+        if tag == "critical" and self.on_critical is not None:
             self.on_critical(key, label, value, unit)
     
-    def _create_value_row(self, key: str, label: str) -> None:
-        """Cria uma nova linha de valor"""
-        row = tk.Frame(self.values_frame, bg=self.colors["panel"])
-        row.pack(fill=tk.X, pady=1)
-        
-        lbl_name = tk.Label(
-            row,
-            text=f"{label}:",
-            font=self.font_small,
-            fg=self.colors["dim"],
-            bg=self.colors["panel"],
-            anchor="w",
-            width=10
-        )
-        lbl_name.pack(side=tk.LEFT)
-        
-        lbl_value = tk.Label(
-            row,
-            text="-",
-            font=self.font_value,
-            fg=self.colors["text"],
-            bg=self.colors["panel"],
-            anchor="e",
-            width=12
-        )
-        lbl_value.pack(side=tk.RIGHT)
+    def _create_value_row(
+        self,
+        key: str,
+        label: str,
+        warn_threshold: Optional[float] = None,
+        crit_threshold: Optional[float] = None
+    ) -> None:
+        """Cria uma nova linha de valor (no fim do texto)"""
+        name = f"{label}:\t"
+        text = self.values_text
+        if self._order:
+            text.insert("end-1c", "\n")
+        text.insert("end-1c", name, "name", "-", "text")
+        self._order.append(key)
+        text.configure(height=len(self._order))
         
         self.labels[key] = {
-            "name": lbl_name,
-            "value": lbl_value,
-            "row": row
+            "label": label,
+            "name_len": len(name),  # valor começa nesta coluna
+            "_last": ("-", "text")  # (texto, tag) escritos por último
         }
+        self._set_thresholds(self.labels[key], warn_threshold, crit_threshold)
+    
+    def _write_value(self, key: str, value_text: str, tag: str) -> None:
+        """Substitui o valor de uma linha"""
+        row = self.labels[key]
+        line = self._order.index(key) + 1
+        start = f"{line}.{row['name_len']}"
+        self.values_text.delete(start, f"{line}.end")
+        self.values_text.insert(start, value_text, tag)
+        row["_last"] = (value_text, tag)
+    
+    @staticmethod
+    def _set_thresholds(
+        row: Dict[str, Any],
+        warn_threshold: Optional[float],
+        crit_threshold: Optional[float]
+    ) -> None:
+        """Registra os thresholds de uma linha"""
+        row["warn"] = warn_threshold
+        row["crit"] = crit_threshold
+        row["_has_thresh"] = warn_threshold is not None or crit_threshold is not None
     
     def _format_value(self, value: Any, unit: str) -> str:
         """Formata valor para exibição"""
-        if isinstance(value, float):
-            if unit == "V":
-                return f"{value:.3f}{unit}"
-            elif unit in ["°C", "%", "W"]:
-                return f"{value:.1f}{unit}"
-            else:
-                return f"{value:.1f}{unit}"
+        if type(value) is float:
+            fmt = _FLOAT_FORMATS.get(unit)
+            return fmt % value if fmt else "%.1f%s" % (value, unit)
         return f"{value}{unit}"
     
-    def _get_value_color(
+    def _get_value_tag(
         self,
         value: Any,
         warn_threshold: Optional[float],
         crit_threshold: Optional[float]
     ) -> str:
-        """Determina cor baseada em thresholds"""
-        if not isinstance(value, (int, float)):
-            return self.colors["text"]
+        """Determina a tag de cor ("text", "warning", "critical") baseada em thresholds"""
+        if type(value) not in (int, float):
+            return "text"
         
-        if crit_threshold and value >= crit_threshold:
-            return self.colors["critical"]
-        elif warn_threshold and value >= warn_threshold:
-            return self.colors["warning"]
+        if crit_threshold is not None and value >= crit_threshold:
+            return "critical"
+        elif warn_threshold is not None and value >= warn_threshold:
+            return "warning"
         
-        return self.colors["text"]
+        return "text"
     
-    def apply_theme(self, colors: Dict[str, str]) -> None:
+    def apply_theme(self, colors: Union[Theme, Dict[str, str]]) -> None:
         """Aplica novo tema ao painel"""
-        self.colors = colors
+        self._cache_colors(colors)
+        bg = self._bg
         
-        self.frame.configure(bg=colors["panel"])
-        self.title_label.configure(bg=colors["panel"], fg=self.accent_color)
-        self.values_frame.configure(bg=colors["panel"])
+        self.frame.configure(bg=bg)
+        self.title_label.configure(bg=bg, fg=self.accent_color)
+        self.values_frame.configure(bg=bg)
         
-        for label_dict in self.labels.values():
-            label_dict["row"].configure(bg=colors["panel"])
-            label_dict["name"].configure(bg=colors["panel"], fg=colors["dim"])
-            label_dict["value"].configure(bg=colors["panel"])
+        # Todas as linhas mudam de cor via tags: não há widget por linha
+        self.values_text.configure(bg=bg, fg=self._fg_text)
+        self._configure_tags()
     
     def clear(self) -> None:
         """Limpa todos os valores"""
         for key in self.labels:
-            self.labels[key]["value"].config(text="-", fg=self.colors["text"])
+            self._write_value(key, "-", "text")
+    
+    def remove_value(self, key: str) -> None:
+        """Remove um valor do painel (ex.: disco desconectado)"""
+        if self.labels.pop(key, None) is None:
+            return
+        line = self._order.index(key) + 1
+        if line == len(self._order) and line > 1:
+            self.values_text.delete(f"{line - 1}.end", f"{line}.end")
+        else:
+            self.values_text.delete(f"{line}.0", f"{line + 1}.0")
+        self._order.remove(key)
+        self.values_text.configure(height=max(len(self._order), 1))
     
     def destroy(self) -> None:
         """Destrói o painel"""
@@ -2,9 +2,11 @@
 Widget de barra de status reutilizável
 """
 import tkinter as tk
-from typing import Dict, Optional
+from typing import Dict, Optional, Union
 from enum import Enum
 
+from ..themes import Theme, theme_colors
+
 
 class ConnectionStatus(Enum):
     """Estados possíveis de conexão"""
@@ -14,6 +16,15 @@ class ConnectionStatus(Enum):
     ERROR = "error"
 
 
+# Ícone e cor do tema (atributo do Theme) de cada estado
+_STATUS_STYLE: Dict[ConnectionStatus, tuple[str, str]] = {
+    ConnectionStatus.CONNECTED: ("●", "gpu"),
+    ConnectionStatus.DISCONNECTED: ("○", "critical"),
+    ConnectionStatus.CONNECTING: ("◐", "warning"),
+    ConnectionStatus.ERROR: ("✕", "critical"),
+}
+
+
 class StatusBar:
     """
     Barra de status para o dashboard
@@ -27,7 +38,7 @@ class StatusBar:
     def __init__(
         self,
         parent: tk.Widget,
-        colors: Dict[str, str],
+        colors: Union[Theme, Dict[str, str]],
         font: tuple = ('Consolas', 10)
     ):
         """
@@ -35,16 +46,17 @@ class StatusBar:
         
         Args:
             parent: Widget pai
-            colors: Dicionário de cores do tema
+            colors: Tema (Theme ou dicionário de cores)
             font: Fonte do texto
         """
         self.parent = parent
-        self.colors = colors
+        self.colors = theme_colors(colors)
         self.font = font
         
         self.status = ConnectionStatus.DISCONNECTED
         self.logging_enabled = False
         self.extra_info = ""
+        self._base_text = "○ Aguardando conexão..."  # texto do status, sem os flags
         
         self._create_widgets()
     
@@ -52,10 +64,10 @@ class StatusBar:
         """Cria os widgets da barra"""
         self.label = tk.Label(
             self.parent,
-            text="○ Aguardando conexão...",
+            text=self._base_text,
             font=self.font,
-            fg=self.colors.get("dim", "#666666"),
-            bg=self.colors.get("bg", "#1a1a1a")
+            fg=self.colors.dim,
+            bg=self.colors.bg
         )
         self.label.pack(side=tk.TOP, pady=3)
     
@@ -66,11 +78,7 @@ class StatusBar:
         Args:
             timestamp: Horário da última atualização
         """
-        self.status = ConnectionStatus.CONNECTED
-        self._update_display(
-            f"● Conectado | Atualizado: {timestamp}",
-            self.colors.get("gpu", "#00ff88")
-        )
+        self._set_status(ConnectionStatus.CONNECTED, f"Conectado | Atualizado: {timestamp}")
     
     def set_disconnected(self, mode_text: str = "") -> None:
         """
@@ -79,17 +87,11 @@ class StatusBar:
         Args:
             mode_text: Texto adicional sobre o modo
         """
-        self.status = ConnectionStatus.DISCONNECTED
-        text = f"○ Desconectado - Aguardando dados...{mode_text}"
-        self._update_display(text, self.colors.get("critical", "#ff3333"))
+        self._set_status(ConnectionStatus.DISCONNECTED, f"Desconectado - Aguardando dados...{mode_text}")
     
     def set_connecting(self) -> None:
         """Define status como conectando"""
-        self.status = ConnectionStatus.CONNECTING
-        self._update_display(
-            "◐ Conectando...",
-            self.colors.get("warning", "#ffcc00")
-        )
+        self._set_status(ConnectionStatus.CONNECTING, "Conectando...")
     
     def set_error(self, message: str) -> None:
         """
@@ -98,11 +100,7 @@ class StatusBar:
         Args:
             message: Mensagem de erro
         """
-        self.status = ConnectionStatus.ERROR
-        self._update_display(
-            f"✕ Erro: {message}",
-            self.colors.get("critical", "#ff3333")
-        )
+        self._set_status(ConnectionStatus.ERROR, f"Erro: {message}")
     
     def set_logging(self, enabled: bool) -> None:
         """
@@ -111,6 +109,8 @@ class StatusBar:
         Args:
             enabled: Se logging está ativo
         """
+        if enabled == self.logging_enabled:
+            return
         self.logging_enabled = enabled
         self._refresh_display()
     
@@ -121,11 +121,20 @@ class StatusBar:
         Args:
             info: Texto adicional
         """
+        if info == self.extra_info:
+            return
         self.extra_info = info
         self._refresh_display()
     
+    def _set_status(self, status: ConnectionStatus, message: str) -> None:
+        """Define o estado e exibe a mensagem com o ícone/cor do estado"""
+        self.status = status
+        icon, color_key = _STATUS_STYLE[status]
+        self._update_display(f"{icon} {message}", getattr(self.colors, color_key))
+    
     def _update_display(self, text: str, color: str) -> None:
         """Atualiza o display da barra"""
+        self._base_text = text
         full_text = text
         
         if self.logging_enabled:
@@ -138,24 +147,19 @@ class StatusBar:
     
     def _refresh_display(self) -> None:
         """Reaplica o display atual com novos flags"""
-        # Reconstrói baseado no status atual
-        if self.status == ConnectionStatus.CONNECTED:
-            # Mantém a cor verde
-            current_text = self.label.cget("text").split(" | ")[0]
-            self._update_display(current_text, self.colors.get("gpu", "#00ff88"))
-        elif self.status == ConnectionStatus.DISCONNECTED:
-            current_text = self.label.cget("text").split(" | ")[0]
-            self._update_display(current_text, self.colors.get("critical", "#ff3333"))
+        # Reconstrói com o texto base guardado e a cor do estado no tema atual
+        _, color_key = _STATUS_STYLE[self.status]
+        self._update_display(self._base_text, getattr(self.colors, color_key))
     
-    def apply_theme(self, colors: Dict[str, str]) -> None:
+    def apply_theme(self, colors: Union[Theme, Dict[str, str]]) -> None:
         """
         Aplica novo tema à barra
         
         Args:
-            colors: Novo dicionário de cores
+            colors: Novo tema (Theme ou dicionário de cores)
         """
-        self.colors = colors
-        self.label.configure(bg=colors.get("bg", "#1a1a1a"))
+        self.colors = theme_colors(colors)
+        self.label.configure(bg=self.colors.bg)
         self._refresh_display()
     
     def get_status(self) -> ConnectionStatus:
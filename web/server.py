@@ -4,19 +4,23 @@ Permite acessar o dashboard de qualquer dispositivo na rede
 """
 from __future__ import annotations
 
+import asyncio
 import json
 import threading
 import time
 import socket
 import gzip
+import zlib
+import hashlib
+import importlib.util
 from pathlib import Path
 from typing import Optional, Any, Dict
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 
 # FastAPI imports (opcional)
 try:
-    from fastapi import FastAPI, WebSocket, WebSocketDisconnect
-    from fastapi.responses import HTMLResponse, JSONResponse
+    from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+    from fastapi.responses import Response, HTMLResponse, JSONResponse, ORJSONResponse
     from fastapi.staticfiles import StaticFiles
     import uvicorn
     HAS_FASTAPI = True
@@ -24,15 +28,78 @@ except ImportError:
     HAS_FASTAPI = False
     print("[Web] FastAPI não instalado. pip install fastapi uvicorn")
 
+# orjson: parse/serialização JSON bem mais rápidos (opcional: pip install orjson)
+try:
+    import orjson
+    HAS_ORJSON = True
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    HAS_ORJSON = False
+    
+    def _json_loads(data: Any) -> Any:
+        # json.loads não aceita memoryview (bytes() de um bytes não copia)
+        return json.loads(bytes(data))
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+# Protocolo compartilhado (formato binário)
+try:
+    from core.protocol import DeltaMerger, MagicByte, StorageReassembler, unpack_binary, zstd_decompress
+    HAS_PROTOCOL_MODULE = True
+except ImportError:
+    HAS_PROTOCOL_MODULE = False
+
+
+# Event loop / parser HTTP em Cython (uvicorn[standard]); "auto" = asyncio/h11 puros
+UVICORN_LOOP = "uvloop" if importlib.util.find_spec("uvloop") else "auto"
+UVICORN_HTTP = "httptools" if importlib.util.find_spec("httptools") else "auto"
+
+# Buffer de recepção UDP (absorve rajadas de vários senders sem descarte no kernel)
+RCVBUF_BYTES = 4 * 1024 * 1024  # Linux limita por net.core.rmem_max
+
+# Início fixo do corpo de /api/status
+STATUS_PREFIX = b'{"status":"online","uptime":'
+
+# Resolução do relógio compartilhado pelos handlers (self._now)
+NOW_TICK_S = 0.1
+
+# Clientes WebSocket atendidos por vez em cada rodada do broadcast
+BROADCAST_BATCH = 50
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class WebConfig:
-    """Configuração do servidor web"""
+    """Configuração do servidor web (imutável)"""
     host: str = "0.0.0.0"
     port: int = 8080
     udp_port: int = 5005  # Porta para receber telemetria
     title: str = "Telemetria Dashboard"
     refresh_interval_ms: int = 1000
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Dicionário pronto para serializar (sem o deepcopy de asdict)"""
+        return {
+            "host": self.host,
+            "port": self.port,
+            "udp_port": self.udp_port,
+            "title": self.title,
+            "refresh_interval_ms": self.refresh_interval_ms
+        }
+
+
+class _TelemetryProtocol(asyncio.DatagramProtocol):
+    """Entrega os datagramas UDP ao servidor direto no event loop"""
+    
+    def __init__(self, server: "TelemetryWebServer"):
+        self._server = server
+    
+    def datagram_received(self, data: bytes, addr) -> None:
+        self._server._ingest(data)
+    
+    def error_received(self, exc: Exception) -> None:
+        print(f"[Web] Erro UDP: {exc}")
 
 
 class TelemetryWebServer:
@@ -48,9 +115,26 @@ class TelemetryWebServer:
         self.config = config or WebConfig()
         self.current_data: Dict[str, Any] = {}
         self.last_update: float = 0
-        self.connected_clients: list = []
-        self._running = False
-        self._udp_thread: Optional[threading.Thread] = None
+        self.connected_clients: set = set()
+        self._uvicorn: Optional["uvicorn.Server"] = None
+        self._udp_transport: Optional[asyncio.DatagramTransport] = None
+        self._bad_magic = 0
+        self._tasks: list = []  # tarefas de fundo no loop do uvicorn
+        self._now: float = time.time()  # relógio grosso, atualizado por _tick_now
+        self._refresh_s = self.config.refresh_interval_ms / 1000
+        self._data_event = asyncio.Event()  # setado a cada snapshot novo (_ingest)
+        self._storage_parts = StorageReassembler() if HAS_PROTOCOL_MODULE else None
+        self._deltas = DeltaMerger() if HAS_PROTOCOL_MODULE else None
+        
+        # JSON do último snapshot como chegou via UDP (None = precisa serializar)
+        self._latest_json: Optional[bytes] = None
+        
+        # /api/telemetry: corpo serializado reaproveitado até o próximo pacote UDP
+        self._cache_ts: float = -1.0
+        self._cache_bytes: bytes = b""
+        
+        # /api/status: só uptime e clients mudam, o resto é fixo
+        self._status_suffix = b',"udp_port":%d}' % self.config.udp_port
         
         if HAS_FASTAPI:
             self.app = self._create_app()
@@ -62,55 +146,237 @@ class TelemetryWebServer:
         app = FastAPI(
             title=self.config.title,
             description="Dashboard de telemetria em tempo real",
-            version="1.0.0"
+            version="1.0.0",
+            default_response_class=ORJSONResponse if HAS_ORJSON else JSONResponse
         )
         
         @app.get("/", response_class=HTMLResponse)
-        async def dashboard():
-            """Página principal do dashboard"""
-            return self._get_dashboard_html()
+        async def dashboard(request: Request):
+            """Página principal do dashboard (gzip + ETag)"""
+            headers = {"ETag": DASHBOARD_ETAG, "Vary": "Accept-Encoding"}
+            if DASHBOARD_ETAG in request.headers.get("if-none-match", ""):
+                return Response(status_code=304, headers=headers)
+            if "gzip" in request.headers.get("accept-encoding", ""):
+                headers["Content-Encoding"] = "gzip"
+                return Response(DASHBOARD_HTML_GZ, media_type="text/html", headers=headers)
+            return Response(DASHBOARD_HTML, media_type="text/html", headers=headers)
         
         @app.get("/api/telemetry")
         async def get_telemetry():
             """Retorna dados de telemetria atuais"""
-            return JSONResponse({
-                "data": self.current_data,
-                "last_update": self.last_update,
-                "connected": time.time() - self.last_update < 5
-            })
+            last_update = self.last_update
+            if last_update != self._cache_ts:
+                # Sem o "}" final para anexar o campo "connected"
+                self._cache_bytes = (b'{"data":' + self._data_json()
+                                     + b',"last_update":' + repr(last_update).encode())
+                self._cache_ts = last_update
+            connected = b'true}' if self._now - last_update < 5 else b'false}'
+            return Response(self._cache_bytes + b',"connected":' + connected,
+                            media_type="application/json")
         
         @app.get("/api/status")
         async def get_status():
             """Retorna status do servidor"""
-            return JSONResponse({
-                "status": "online",
-                "uptime": time.time(),
-                "clients": len(self.connected_clients),
-                "udp_port": self.config.udp_port
-            })
+            body = b'%s%r,"clients":%d%s' % (
+                STATUS_PREFIX, self._now, len(self.connected_clients), self._status_suffix)
+            return Response(body, media_type="application/json")
         
         @app.websocket("/ws")
         async def websocket_endpoint(websocket: WebSocket):
-            """WebSocket para atualizações em tempo real"""
+            """WebSocket para atualizações em tempo real (envio feito pelo _broadcaster)"""
             await websocket.accept()
-            self.connected_clients.append(websocket)
+            self.connected_clients.add(websocket)
             
             try:
+                # Só aguarda mensagens para detectar a desconexão
                 while True:
-                    # Envia dados a cada segundo
-                    await websocket.send_json({
-                        "data": self.current_data,
-                        "timestamp": time.time()
-                    })
-                    await asyncio.sleep(self.config.refresh_interval_ms / 1000)
+                    await websocket.receive_text()
             except WebSocketDisconnect:
-                self.connected_clients.remove(websocket)
+                pass
+            finally:
+                # Qualquer saída (erro, cancelamento) remove o cliente;
+                # discard: o broadcaster pode já ter removido
+                self.connected_clients.discard(websocket)
+        
+        @app.on_event("startup")
+        async def start_background():
+            await self._start_udp_receiver()
+            self._tasks = [
+                asyncio.create_task(self._tick_now()),
+                asyncio.create_task(self._broadcaster())
+            ]
+        
+        @app.on_event("shutdown")
+        async def stop_background():
+            for task in self._tasks:
+                task.cancel()
+            if self._udp_transport is not None:
+                self._udp_transport.close()
         
         return app
     
-    def _get_dashboard_html(self) -> str:
-        """Retorna HTML do dashboard"""
-        return '''<!DOCTYPE html>
+    async def _tick_now(self):
+        """Atualiza self._now a cada NOW_TICK_S (handlers leem o atributo, sem syscall)"""
+        while True:
+            self._now = time.time()
+            await asyncio.sleep(NOW_TICK_S)
+    
+    async def _broadcaster(self):
+        """
+        Envia o snapshot a todos os clientes WebSocket (serializado uma vez)
+        
+        Acorda a cada pacote UDP recebido; sem dados novos, reenvia após
+        refresh_interval_ms como keepalive (atualiza "connected" no dashboard).
+        """
+        while True:
+            try:
+                await asyncio.wait_for(self._data_event.wait(), timeout=self._refresh_s)
+            except asyncio.TimeoutError:
+                pass
+            self._data_event.clear()
+            if not self.connected_clients:
+                continue
+            
+            now = self._now
+            connected = b'true' if now - self.last_update < 5 else b'false'
+            payload = (b'{"data":' + self._data_json() + b',"timestamp":' + repr(now).encode()
+                       + b',"connected":' + connected + b'}').decode()
+            
+            clients = list(self.connected_clients)
+            for i in range(0, len(clients), BROADCAST_BATCH):
+                batch = clients[i:i + BROADCAST_BATCH]
+                results = await asyncio.gather(
+                    *(ws.send_text(payload) for ws in batch),
+                    return_exceptions=True
+                )
+                for ws, result in zip(batch, results):
+                    if isinstance(result, Exception):
+                        self.connected_clients.discard(ws)
+                # Devolve o loop entre lotes para não travar outras tarefas
+                await asyncio.sleep(0)
+    
+    async def _start_udp_receiver(self) -> None:
+        """Abre o endpoint UDP no loop do uvicorn (sem thread dedicada)"""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, RCVBUF_BYTES)
+        except OSError as e:
+            print(f"[Web] Erro ao ajustar SO_RCVBUF: {e}")
+        sock.bind(("0.0.0.0", self.config.udp_port))
+        
+        loop = asyncio.get_running_loop()
+        self._udp_transport, _ = await loop.create_datagram_endpoint(
+            lambda: _TelemetryProtocol(self), sock=sock
+        )
+        print(f"[Web] Receptor UDP ouvindo na porta {self.config.udp_port}")
+    
+    def _data_json(self) -> bytes:
+        """JSON de current_data: o recebido via UDP quando possível, senão serializado"""
+        if self._latest_json is not None:
+            return self._latest_json
+        return _json_dumps(self.current_data)
+    
+    def _ingest(self, data: bytes) -> None:
+        """Decodifica um datagrama de telemetria e atualiza current_data"""
+        try:
+            # Decodifica (magic byte); framing desconhecido é descartado
+            # memoryview: fatiar o magic byte não copia o datagrama
+            payload = None
+            mv = memoryview(data)
+            magic = mv[0] if mv else -1
+            if magic == 0x01:  # GZIP (wbits=31: zlib lê o cabeçalho gzip, uma única alocação)
+                data = zlib.decompress(mv[1:], wbits=31)
+            elif magic == 0x00:  # Raw JSON
+                data = mv[1:]
+            elif HAS_PROTOCOL_MODULE and magic == MagicByte.ZSTD:
+                data = zstd_decompress(mv[1:])
+            elif HAS_PROTOCOL_MODULE and magic == MagicByte.BINARY:
+                payload = unpack_binary(mv[1:])
+            else:
+                self._bad_magic += 1
+                if self._bad_magic & 0xff == 1:  # 1º e depois a cada 256
+                    print(f"[Web] Pacote UDP com magic byte desconhecido "
+                          f"({magic}), descartado ({self._bad_magic} no total)")
+                return
+            
+            latest_json = None
+            if payload is None:
+                payload = _json_loads(data)
+                # Snapshot simples: o JSON recebido já é a resposta, sem reserializar
+                if ("samples" not in payload and "storage_chunks" not in payload
+                        and payload.get("type") != "delta"):
+                    latest_json = data
+            
+            # Storage dividido em vários pacotes (payload acima do MTU)
+            if HAS_PROTOCOL_MODULE:
+                payload = self._storage_parts.feed(payload)
+            elif "storage_chunk" in payload:
+                payload = None
+            if payload is None:
+                return
+            
+            # Lote de amostras (sender com lote_ms > 0): vale a mais recente
+            samples = payload["samples"] if "samples" in payload else (payload,)
+            
+            # Atualização diferencial (sender com delta_a_cada > 0): completa com o snapshot
+            if HAS_PROTOCOL_MODULE:
+                samples = [s for s in map(self._deltas.feed, samples) if s is not None]
+            else:
+                samples = [s for s in samples if s.get("type") != "delta"]
+            if not samples:
+                return
+            self.current_data = samples[-1]
+            self._latest_json = latest_json
+            self.last_update = time.time()
+            self._data_event.set()
+            
+        except Exception as e:
+            print(f"[Web] Erro UDP: {e}")
+    
+    def run(self, block: bool = True) -> None:
+        """
+        Inicia o servidor web
+        
+        Args:
+            block: Se True, bloqueia a thread principal
+        """
+        if not HAS_FASTAPI:
+            print("[Web] FastAPI não disponível. Instale com: pip install fastapi uvicorn")
+            return
+        
+        print(f"[Web] Dashboard disponível em http://{self.config.host}:{self.config.port}")
+        print(f"[Web] Acesse de qualquer dispositivo na rede!")
+        
+        # Server guardado para stop() (uvicorn.run não expõe como encerrar)
+        self._uvicorn = uvicorn.Server(uvicorn.Config(
+            self.app,
+            host=self.config.host,
+            port=self.config.port,
+            log_level="warning",
+            loop=UVICORN_LOOP,
+            http=UVICORN_HTTP
+        ))
+        
+        if block:
+            self._uvicorn.run()
+        else:
+            thread = threading.Thread(target=self._uvicorn.run, daemon=True)
+            thread.start()
+    
+    def stop(self) -> None:
+        """
+        Para o servidor
+        
+        O uvicorn encerra no próximo ciclo e dispara o shutdown da aplicação,
+        que fecha o receptor UDP e cancela as tarefas de fundo.
+        """
+        if self._uvicorn is not None:
+            self._uvicorn.should_exit = True
+
+
+# ========== DASHBOARD (HTML estático) ==========
+_DASHBOARD_SRC = '''<!DOCTYPE html>
 <html lang="pt-BR">
 <head>
     <meta charset="UTF-8">
@@ -330,12 +596,20 @@ class TelemetryWebServer:
     
     <script>
         const API_URL = '/api/telemetry';
-        const REFRESH_MS = 1000;
-        
-        function getClass(value, warn, crit) {
-            if (value >= crit) return 'critical';
-            if (value >= warn) return 'warning';
-            return '';
+        const WS_URL = (location.protocol === 'https:' ? 'wss://' : 'ws://') + location.host + '/ws';
+        const RECONNECT_MS = 2000;
+        
+        // Elementos buscados uma única vez (o script roda após o DOM)
+        const el = {};
+        ['status', 'cpu-usage', 'cpu-bar', 'cpu-temp', 'cpu-clock', 'cpu-power',
+         'gpu-load', 'gpu-bar', 'gpu-temp', 'gpu-clock', 'gpu-mem', 'gpu-fan',
+         'ram-percent', 'ram-bar', 'ram-used', 'ram-total',
+         'net-down', 'net-up', 'net-ping', 'net-link'
+        ].forEach(id => el[id] = document.getElementById(id));
+        
+        function setLevel(node, value, warn, crit) {
+            node.classList.toggle('critical', value >= crit);
+            node.classList.toggle('warning', value >= warn && value < crit);
         }
         
         function updateUI(data) {
@@ -343,47 +617,55 @@ class TelemetryWebServer:
             
             // CPU
             const cpuUsage = data.cpu.usage || 0;
-            document.getElementById('cpu-usage').textContent = cpuUsage.toFixed(1) + '%';
-            document.getElementById('cpu-usage').className = 'metric-value ' + getClass(cpuUsage, 70, 90);
-            document.getElementById('cpu-bar').style.width = cpuUsage + '%';
+            el['cpu-usage'].textContent = cpuUsage.toFixed(1) + '%';
+            setLevel(el['cpu-usage'], cpuUsage, 70, 90);
+            el['cpu-bar'].style.width = cpuUsage + '%';
             
             const cpuTemp = data.cpu.temp || 0;
-            document.getElementById('cpu-temp').textContent = cpuTemp.toFixed(1) + '°C';
-            document.getElementById('cpu-temp').className = 'metric-value ' + getClass(cpuTemp, 70, 85);
+            el['cpu-temp'].textContent = cpuTemp.toFixed(1) + '°C';
+            setLevel(el['cpu-temp'], cpuTemp, 70, 85);
             
-            document.getElementById('cpu-clock').textContent = (data.cpu.clock || 0).toFixed(0) + ' MHz';
-            document.getElementById('cpu-power').textContent = (data.cpu.power || 0).toFixed(1) + ' W';
+            el['cpu-clock'].textContent = (data.cpu.clock || 0).toFixed(0) + ' MHz';
+            el['cpu-power'].textContent = (data.cpu.power || 0).toFixed(1) + ' W';
             
             // GPU
             const gpuLoad = data.gpu?.load || 0;
-            document.getElementById('gpu-load').textContent = gpuLoad.toFixed(1) + '%';
-            document.getElementById('gpu-bar').style.width = gpuLoad + '%';
+            el['gpu-load'].textContent = gpuLoad.toFixed(1) + '%';
+            el['gpu-bar'].style.width = gpuLoad + '%';
             
             const gpuTemp = data.gpu?.temp || 0;
-            document.getElementById('gpu-temp').textContent = gpuTemp.toFixed(1) + '°C';
-            document.getElementById('gpu-temp').className = 'metric-value ' + getClass(gpuTemp, 75, 90);
+            el['gpu-temp'].textContent = gpuTemp.toFixed(1) + '°C';
+            setLevel(el['gpu-temp'], gpuTemp, 75, 90);
             
-            document.getElementById('gpu-clock').textContent = (data.gpu?.clock_core || 0).toFixed(0) + ' MHz';
-            document.getElementById('gpu-mem').textContent = (data.gpu?.mem_used_mb || 0).toFixed(0) + ' MB';
-            document.getElementById('gpu-fan').textContent = (data.gpu?.fan || 0).toFixed(0) + ' RPM';
+            el['gpu-clock'].textContent = (data.gpu?.clock_core || 0).toFixed(0) + ' MHz';
+            el['gpu-mem'].textContent = (data.gpu?.mem_used_mb || 0).toFixed(0) + ' MB';
+            el['gpu-fan'].textContent = (data.gpu?.fan || 0).toFixed(0) + ' RPM';
             
             // RAM
             const ramPercent = data.ram?.percent || 0;
-            document.getElementById('ram-percent').textContent = ramPercent.toFixed(1) + '%';
-            document.getElementById('ram-percent').className = 'metric-value ' + getClass(ramPercent, 70, 90);
-            document.getElementById('ram-bar').style.width = ramPercent + '%';
-            document.getElementById('ram-used').textContent = (data.ram?.used_gb || 0).toFixed(1) + ' GB';
-            document.getElementById('ram-total').textContent = (data.ram?.total_gb || 0).toFixed(1) + ' GB';
+            el['ram-percent'].textContent = ramPercent.toFixed(1) + '%';
+            setLevel(el['ram-percent'], ramPercent, 70, 90);
+            el['ram-bar'].style.width = ramPercent + '%';
+            el['ram-used'].textContent = (data.ram?.used_gb || 0).toFixed(1) + ' GB';
+            el['ram-total'].textContent = (data.ram?.total_gb || 0).toFixed(1) + ' GB';
             
             // Network
-            document.getElementById('net-down').textContent = (data.network?.down_kbps || 0).toFixed(1) + ' KB/s';
-            document.getElementById('net-up').textContent = (data.network?.up_kbps || 0).toFixed(1) + ' KB/s';
+            el['net-down'].textContent = (data.network?.down_kbps || 0).toFixed(1) + ' KB/s';
+            el['net-up'].textContent = (data.network?.up_kbps || 0).toFixed(1) + ' KB/s';
             
             const ping = data.network?.ping_ms || 0;
-            document.getElementById('net-ping').textContent = ping.toFixed(0) + ' ms';
-            document.getElementById('net-ping').className = 'metric-value ' + getClass(ping, 50, 100);
+            el['net-ping'].textContent = ping.toFixed(0) + ' ms';
+            setLevel(el['net-ping'], ping, 50, 100);
             
-            document.getElementById('net-link').textContent = (data.network?.link_speed_mbps || 0) + ' Mbps';
+            el['net-link'].textContent = (data.network?.link_speed_mbps || 0) + ' Mbps';
+        }
+        
+        function setConnected(connected) {
+            el['status'].textContent = connected
+                ? '● Conectado - ' + new Date().toLocaleTimeString()
+                : '○ Aguardando dados...';
+            el['status'].classList.toggle('connected', connected);
+            el['status'].classList.toggle('disconnected', !connected);
         }
         
         async function fetchData() {
@@ -391,108 +673,49 @@ class TelemetryWebServer:
                 const response = await fetch(API_URL);
                 const result = await response.json();
                 
-                const statusEl = document.getElementById('status');
-                if (result.connected) {
-                    statusEl.textContent = '● Conectado - ' + new Date().toLocaleTimeString();
-                    statusEl.className = 'status connected';
-                    updateUI(result.data);
-                } else {
-                    statusEl.textContent = '○ Aguardando dados...';
-                    statusEl.className = 'status disconnected';
-                }
+                setConnected(result.connected);
+                if (result.connected) updateUI(result.data);
             } catch (e) {
                 console.error('Erro:', e);
             }
         }
         
-        // Inicia polling
+        function connect() {
+            const ws = new WebSocket(WS_URL);
+            ws.onmessage = ev => {
+                const result = JSON.parse(ev.data);
+                setConnected(result.connected);
+                if (result.connected) updateUI(result.data);
+            };
+            ws.onclose = () => {
+                setConnected(false);
+                setTimeout(connect, RECONNECT_MS);
+            };
+        }
+        
+        // Estado inicial via REST, depois atualizações pelo WebSocket
         fetchData();
-        setInterval(fetchData, REFRESH_MS);
+        connect();
     </script>
 </body>
 </html>'''
+
+
+def _minify_html(html: str) -> str:
+    """
+    Remove indentação, linhas vazias e comentários de linha do JS
     
-    def _start_udp_receiver(self) -> None:
-        """Inicia thread para receber dados UDP"""
-        def receiver_loop():
-            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-            sock.bind(("0.0.0.0", self.config.udp_port))
-            sock.settimeout(1.0)
-            
-            print(f"[Web] Receptor UDP ouvindo na porta {self.config.udp_port}")
-            
-            while self._running:
-                try:
-                    data, addr = sock.recvfrom(16384)
-                    
-                    # Decodifica (magic byte)
-                    if len(data) > 0:
-                        magic = data[0]
-                        if magic == 0x01:  # GZIP
-                            data = gzip.decompress(data[1:])
-                        elif magic == 0x00:  # Raw JSON
-                            data = data[1:]
-                        else:
-                            try:
-                                data = gzip.decompress(data)
-                            except:
-                                pass
-                    
-                    payload = json.loads(data.decode())
-                    self.current_data = payload
-                    self.last_update = time.time()
-                    
-                except socket.timeout:
-                    continue
-                except Exception as e:
-                    print(f"[Web] Erro UDP: {e}")
-            
-            sock.close()
-        
-        self._udp_thread = threading.Thread(target=receiver_loop, daemon=True)
-        self._udp_thread.start()
-    
-    def run(self, block: bool = True) -> None:
-        """
-        Inicia o servidor web
-        
-        Args:
-            block: Se True, bloqueia a thread principal
-        """
-        if not HAS_FASTAPI:
-            print("[Web] FastAPI não disponível. Instale com: pip install fastapi uvicorn")
-            return
-        
-        self._running = True
-        self._start_udp_receiver()
-        
-        print(f"[Web] Dashboard disponível em http://{self.config.host}:{self.config.port}")
-        print(f"[Web] Acesse de qualquer dispositivo na rede!")
-        
-        if block:
-            uvicorn.run(
-                self.app,
-                host=self.config.host,
-                port=self.config.port,
-                log_level="warning"
-            )
-        else:
-            thread = threading.Thread(
-                target=uvicorn.run,
-                kwargs={
-                    "app": self.app,
-                    "host": self.config.host,
-                    "port": self.config.port,
-                    "log_level": "warning"
-                },
-                daemon=True
-            )
-            thread.start()
-    
-    def stop(self) -> None:
-        """Para o servidor"""
-        self._running = False
+    Mantém as quebras de linha: o JS não pode depender de ";" implícito
+    entre linhas que viram uma só.
+    """
+    lines = (line.strip() for line in html.splitlines())
+    return "\n".join(line for line in lines if line and not line.startswith("//"))
+
+
+# Minificado, comprimido e hasheado uma única vez (na importação)
+DASHBOARD_HTML = _minify_html(_DASHBOARD_SRC).encode("utf-8")
+DASHBOARD_HTML_GZ = gzip.compress(DASHBOARD_HTML, 9)
+DASHBOARD_ETAG = '"%s"' % hashlib.md5(DASHBOARD_HTML, usedforsecurity=False).hexdigest()
 
 
 def create_app(config: Optional[WebConfig] = None) -> Optional[FastAPI]:
@@ -532,5 +755,4 @@ def run_server(
 
 # Para uso direto: python -m web.server
 if __name__ == "__main__":
-    import asyncio
     run_server()